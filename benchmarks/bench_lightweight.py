@@ -0,0 +1,42 @@
+"""Wall time and browser memory per object with a default vs a lightweight Chrome.
+
+Runs the benchmark scenarios from `run.py` against pages that each pull in
+`--assets` images plus a font, a video and a tracking script, once with plain
+headless Chrome and once with `create_driver(lightweight=True)`, which loads
+pages eagerly and blocks those requests.
+
+    python benchmarks/bench_lightweight.py --assets 20 --repeat 3
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import run
+
+
+def megabytes(rss):
+    return f"{rss / 2 ** 20:.0f} MB" if rss else "n/a"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--assets", type=int, default=20, help="images to add to every page")
+    parser.add_argument("--delay", type=float, default=0, help="seconds before each page renders")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--only", nargs="+", help="scenarios to run, e.g. Person Company")
+    args = parser.parse_args()
+
+    before = run.run(args.only, args.repeat, args.delay, run.chrome, args.assets)
+    after = run.run(args.only, args.repeat, args.delay, run.lightweight_chrome, args.assets)
+
+    print(f"{'object':<16}{'default':>10}{'lightweight':>13}{'speedup':>10}{'default RSS':>14}{'lightweight RSS':>17}")
+    for name in before:
+        slow, fast = before[name]["wall_time"], after[name]["wall_time"]
+        print(f"{name:<16}{slow:>9.2f}s{fast:>12.2f}s{slow / fast:>9.1f}x"
+              f"{megabytes(before[name]['peak_rss']):>14}{megabytes(after[name]['peak_rss']):>17}")
+
+
+if __name__ == "__main__":
+    main()
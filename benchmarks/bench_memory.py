@@ -0,0 +1,58 @@
+"""Memory per record for the slotted dataclasses in `objects.py` vs plain `__dict__` ones.
+
+Builds `--count` instances of `Contact`, `Experience` and `Education`, and of
+an unslotted copy of each with the same fields, and reports the bytes per
+instance allocated, measured with `tracemalloc`. No browser is needed.
+
+    python benchmarks/bench_memory.py --count 200000
+"""
+import argparse
+import dataclasses
+import gc
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from linkedin_scraper.objects import Contact, Experience, Education
+
+
+def unslotted(cls):
+    """A plain dataclass with the same fields and defaults as `cls`."""
+    return dataclasses.make_dataclass(
+        cls.__name__,
+        [(field.name, field.type, dataclasses.field(default=field.default)) for field in dataclasses.fields(cls)]
+    )
+
+
+def sample(cls):
+    # the same strings for every instance, so only the per-instance overhead is measured
+    return {field.name: f"{field.name} value" for field in dataclasses.fields(cls)}
+
+
+def bytes_per_instance(cls, count):
+    values = sample(cls)
+    gc.collect()
+    tracemalloc.start()
+    records = [cls(**values) for _ in range(count)]
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del records
+    return allocated / count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=100000)
+    args = parser.parse_args()
+
+    print(f"{'record':<12}{'__dict__':>12}{'slots':>12}{'saved':>8}")
+    for cls in (Contact, Experience, Education):
+        plain = bytes_per_instance(unslotted(cls), args.count)
+        slotted = bytes_per_instance(cls, args.count)
+        print(f"{cls.__name__:<12}{plain:>11.0f}B{slotted:>11.0f}B{1 - slotted / plain:>8.0%}")
+
+
+if __name__ == "__main__":
+    main()
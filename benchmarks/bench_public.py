@@ -0,0 +1,42 @@
+"""Throughput of `Company(http=True)` against the local fixture server.
+
+Fetches the public company page `--count` times with `scrape_public_companies`
+at each of the given worker counts, and reports companies per second. No
+browser is needed. The server runs in the same process, so parsing and serving
+compete for the GIL here; against linkedin.com network latency dominates and
+more workers help.
+
+    python benchmarks/bench_public.py --count 2000 --workers 1 8 64 256
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from linkedin_scraper.company import http_session
+from linkedin_scraper.pool import scrape_public_companies
+
+from server import FixtureServer
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=1000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 8, 64])
+    args = parser.parse_args()
+
+    with FixtureServer() as server:
+        urls = [f"{server.url}/company/acme-{i}/" for i in range(args.count)]
+        print(f"{'workers':>8}{'companies/s':>14}{'errors':>8}")
+        for workers in args.workers:
+            session = http_session(pool_size=workers)
+            start = time.perf_counter()
+            errors = sum(not result.ok for result in scrape_public_companies(urls, workers=workers, session=session))
+            elapsed = time.perf_counter() - start
+            print(f"{workers:>8}{args.count / elapsed:>14.0f}{errors:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+"""Wall-clock time per object with fixed sleeps vs readiness-condition waits.
+
+Runs the benchmark scenarios from `run.py` against pages that render client
+side after `--delay` seconds, once with `Scraper.CONSERVATIVE_WAITS` on and
+once off.
+
+    python benchmarks/bench_waits.py --delay 0.3 --repeat 3
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from linkedin_scraper.objects import Scraper
+
+import run
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--delay", type=float, default=0.3, help="seconds before each page renders")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--only", nargs="+", help="scenarios to run, e.g. Person Company")
+    args = parser.parse_args()
+
+    try:
+        Scraper.CONSERVATIVE_WAITS = True
+        before = run.run(args.only, args.repeat, args.delay)
+        Scraper.CONSERVATIVE_WAITS = False
+        after = run.run(args.only, args.repeat, args.delay)
+    finally:
+        Scraper.CONSERVATIVE_WAITS = False
+
+    print(f"{'object':<16}{'fixed sleeps':>14}{'conditions':>14}{'speedup':>10}")
+    for name in before:
+        slow, fast = before[name]["wall_time"], after[name]["wall_time"]
+        print(f"{name:<16}{slow:>13.2f}s{fast:>13.2f}s{slow / fast:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+"""Benchmark every scraper class offline against the saved pages in `fixtures/`.
+
+Starts the local fixture server, runs `Person`, `Company`, `Job`, `JobSearch`
+and `PeopleSearch` against it in headless Chrome, and reports per object the
+median wall time, the number of WebDriver commands, and the peak RSS of the
+browser (chromedriver and all of its Chrome processes).
+
+    python benchmarks/run.py --repeat 5
+    python benchmarks/run.py --only Person --json results.json
+    python benchmarks/run.py --phases
+    python benchmarks/run.py --assets 20 --lightweight
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+
+from linkedin_scraper import Person, Company, Job, JobSearch, PeopleSearch
+from linkedin_scraper.driver_factory import create_driver
+from linkedin_scraper.instrumentation import HistogramSink
+from linkedin_scraper.objects import Scraper, count_commands
+from linkedin_scraper.tabs import scrape_jobs
+
+from server import FixtureServer
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+
+def chrome():
+    options = Options()
+    options.add_argument("--headless=new")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    return webdriver.Chrome(options=options)
+
+
+def lightweight_chrome():
+    return create_driver(lightweight=True, arguments=("--no-sandbox", "--disable-dev-shm-usage"))
+
+
+def process_tree_rss(pid):
+    """Resident memory in bytes of `pid` and all of its descendants, or None if it can't be read."""
+    if psutil is not None:
+        try:
+            root = psutil.Process(pid)
+            processes = [root] + root.children(recursive=True)
+            return sum(process.memory_info().rss for process in processes)
+        except psutil.Error:
+            return None
+    if not os.path.isdir("/proc"):
+        return None
+
+    children = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        children.setdefault(ppid, []).append(int(entry))
+
+    total, stack = 0, [pid]
+    page_size = os.sysconf("SC_PAGE_SIZE")
+    while stack:
+        current = stack.pop()
+        try:
+            with open(f"/proc/{current}/statm") as f:
+                total += int(f.read().split()[1]) * page_size
+        except (OSError, IndexError, ValueError):
+            pass
+        stack.extend(children.get(current, []))
+    return total
+
+
+class PeakRss(object):
+    """Samples the RSS of a process tree in the background and keeps the maximum."""
+
+    def __init__(self, pid, interval=0.05):
+        self.pid = pid
+        self.interval = interval
+        self.peak = None
+        self._stop = threading.Event()
+
+    def _sample(self):
+        while not self._stop.is_set():
+            rss = process_tree_rss(self.pid)
+            if rss is not None:
+                self.peak = max(self.peak or 0, rss)
+            self._stop.wait(self.interval)
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+
+def scenarios(base_url, driver):
+    return {
+        "Person": lambda: Person(f"{base_url}/in/jane-doe/", driver=driver, close_on_complete=False),
+        "Company": lambda: Company(f"{base_url}/company/acme/", driver=driver, close_on_complete=False),
+        "CompanyPublic": lambda: Company(f"{base_url}/company/acme/", http=True),
+        "PersonTabs": lambda: Person(f"{base_url}/in/jane-doe/", driver=driver, close_on_complete=False, tabs=True),
+        "Job": lambda: Job(f"{base_url}/jobs/view/3900000000/", driver=driver, close_on_complete=False),
+        "Jobs": lambda: [Job(f"{base_url}/jobs/view/39000000{i:02}/", driver=driver, close_on_complete=False) for i in range(8)],
+        "JobsInTabs": lambda: list(scrape_jobs(driver, [f"{base_url}/jobs/view/39000000{i:02}/" for i in range(8)], tabs=4)),
+        "JobSearch": lambda: JobSearch(driver, base_url=f"{base_url}/jobs/", scrape=False).search("doctor"),
+        "JobSearchHydrate": lambda: JobSearch(driver, base_url=f"{base_url}/jobs/", scrape=False).search("doctor", hydrate=True, concurrency=4),
+        "JobSearchPages": lambda: list(JobSearch(driver, base_url=f"{base_url}/jobs/", scrape=False).iter_search("doctor", max_results=60)),
+        "PeopleSearch": lambda: PeopleSearch(driver, base_url=f"{base_url}/", scrape=False).search("jane doe"),
+        "PeopleSearchPages": lambda: list(PeopleSearch(driver, base_url=f"{base_url}/", scrape=False).iter_search("jane doe", pages=3)),
+    }
+
+
+def measure(run, driver, repeat):
+    """Run a scenario `repeat` times and return the median wall time, commands and peak RSS."""
+    timings, commands, peaks = [], [], []
+    for _ in range(repeat):
+        commands_before = driver.command_count
+        with PeakRss(driver.service.process.pid) as rss:
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                run()
+            timings.append(time.perf_counter() - start)
+        commands.append(driver.command_count - commands_before)
+        if rss.peak is not None:
+            peaks.append(rss.peak)
+    return {
+        "wall_time": statistics.median(timings),
+        "commands": int(statistics.median(commands)),
+        "peak_rss": max(peaks) if peaks else None,
+    }
+
+
+def run(names=None, repeat=3, delay=0, driver_factory=chrome, assets=0):
+    with FixtureServer(delay=delay, assets=assets) as server:
+        connections_url = Person.CONNECTIONS_URL
+        Person.CONNECTIONS_URL = f"{server.url}/mynetwork/invite-connect/connections/"
+        driver = driver_factory()
+        count_commands(driver)
+        try:
+            driver.get(f"{server.url}/feed/")
+            # the server only serves logged in pages to a browser with a session cookie
+            driver.add_cookie({"name": "li_at", "value": "fixture"})
+            results = {}
+            for name, scenario in scenarios(server.url, driver).items():
+                if names and name not in names:
+                    continue
+                results[name] = measure(scenario, driver, repeat)
+            return results
+        finally:
+            Person.CONNECTIONS_URL = connections_url
+            driver.quit()
+
+
+def report(results):
+    print(f"{'object':<16}{'wall time':>12}{'commands':>10}{'peak RSS':>12}")
+    for name, result in results.items():
+        rss = f"{result['peak_rss'] / 2 ** 20:.0f} MB" if result["peak_rss"] else "n/a"
+        print(f"{name:<16}{result['wall_time']:>11.2f}s{result['commands']:>10}{rss:>12}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--delay", type=float, default=0, help="seconds before each page renders")
+    parser.add_argument("--only", nargs="+", help="scenarios to run, e.g. Person Company")
+    parser.add_argument("--assets", type=int, default=0, help="images to add to every page")
+    parser.add_argument("--lightweight", action="store_true", help="use create_driver(lightweight=True)")
+    parser.add_argument("--json", help="also write the results to this file")
+    parser.add_argument("--phases", action="store_true", help="also print time and commands per scrape phase")
+    args = parser.parse_args()
+
+    phases = HistogramSink()
+    if args.phases:
+        Scraper.add_listener(phases)
+    driver_factory = lightweight_chrome if args.lightweight else chrome
+    results = run(args.only, args.repeat, args.delay, driver_factory, args.assets)
+    report(results)
+    if args.phases:
+        print()
+        print(phases)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
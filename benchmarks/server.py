@@ -0,0 +1,157 @@
+"""Local HTTP stand-in for linkedin.com that serves the saved pages in `fixtures/`.
+
+    python benchmarks/server.py --port 8000 --delay 0.3 --assets 20
+
+With `--delay` every page is served with its body held back and inserted by
+script after that many seconds, the way LinkedIn renders client side, so the
+wait conditions have something to wait for. With `--assets` every page also
+pulls in that many images, plus a font, a video and a tracking script, each
+served after `--asset-delay` seconds, the way a real profile page does.
+
+Like linkedin.com, requests without an `li_at` cookie get the public version
+of a page where there is one (`<fixture>_public.html`).
+"""
+import argparse
+import os
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+ROUTES = [
+    (r"^/in/[^/]+/details/experience", "experience.html"),
+    (r"^/in/[^/]+/details/education", "education.html"),
+    (r"^/in/[^/]+", "profile.html"),
+    (r"^/company/[^/]+/about", "company_about.html"),
+    (r"^/company/[^/]+/people", "people.html"),
+    (r"^/company/[^/]+", "company.html"),
+    (r"^/jobs/view/", "job.html"),
+    (r"^/jobs/search", "job_search.html"),
+    (r"^/search/results/people", "people_search.html"),
+    (r"^/mynetwork/invite-connect/connections", "connections.html"),
+    (r"^/", "feed.html"),
+]
+
+ASSET_SIZE = 64 * 1024
+ASSET_TYPES = {
+    ".jpg": "image/jpeg",
+    ".woff2": "font/woff2",
+    ".mp4": "video/mp4",
+}
+
+
+def fixture_for(path):
+    for pattern, fixture in ROUTES:
+        if re.match(pattern, path):
+            return fixture
+
+
+def delay_body(page, delay):
+    """Hold the body of `page` back and insert it into the DOM after `delay` seconds."""
+    head, _, rest = page.partition("<body>")
+    body, _, tail = rest.partition("</body>")
+    markup, _, script = body.partition("<script>")
+    script = script.replace("</script>", "")
+    return f"""{head}<body><div id="fixture-root"></div>
+<template id="fixture-body">{markup}</template>
+<script>
+  setTimeout(() => {{
+    document.getElementById("fixture-root").appendChild(document.getElementById("fixture-body").content);
+    {script}
+  }}, {int(delay * 1000)});
+</script></body>{tail}"""
+
+
+def with_assets(page, count):
+    """Reference `count` images, a web font, a video and a tracking script from `page`."""
+    images = "".join(f'<img alt="" src="/assets/image-{i}.jpg" width="1" height="1">' for i in range(count))
+    head = ('<style>@font-face { font-family: "Fixture"; src: url("/assets/font.woff2"); }'
+            ' body { font-family: "Fixture", sans-serif; }</style>')
+    body = f'{images}<video src="/assets/clip.mp4" preload="auto" muted></video><script src="/li/track?page=1"></script>'
+    return page.replace("</head>", head + "</head>", 1).replace("</body>", body + "</body>", 1)
+
+
+class FixtureServer(object):
+
+    def __init__(self, host="127.0.0.1", port=0, delay=0, fixtures=FIXTURES, assets=0, asset_delay=0.05):
+        self.delay = delay
+        self.assets = assets
+        self.asset_delay = asset_delay
+        self.fixtures = fixtures
+        self.requests = []
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                server.requests.append(self.path)
+                path = self.path.split("?")[0]
+                if path.startswith("/assets/") or path.startswith("/li/track"):
+                    self.send_asset(path)
+                    return
+                fixture = fixture_for(path)
+                if fixture is None or not os.path.exists(os.path.join(server.fixtures, fixture)):
+                    self.send_error(404)
+                    return
+                public = fixture.replace(".html", "_public.html")
+                if "li_at=" not in self.headers.get("Cookie", "") and os.path.exists(os.path.join(server.fixtures, public)):
+                    fixture = public
+                with open(os.path.join(server.fixtures, fixture), encoding="utf-8") as f:
+                    page = f.read()
+                if server.assets:
+                    page = with_assets(page, server.assets)
+                if server.delay:
+                    page = delay_body(page, server.delay)
+                payload = page.encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def send_asset(self, path):
+                time.sleep(server.asset_delay)
+                content_type = ASSET_TYPES.get(os.path.splitext(path)[1])
+                if content_type is None:
+                    content_type, payload = "application/javascript", b"void 0;"
+                else:
+                    payload = bytes(ASSET_SIZE)
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(payload)))
+                self.send_header("Cache-Control", "no-store")
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer((host, port), Handler)
+        self.url = f"http://{host}:{self.httpd.server_port}"
+
+    def start(self):
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve the saved LinkedIn pages locally")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--delay", type=float, default=0)
+    parser.add_argument("--assets", type=int, default=0, help="images to add to every page")
+    parser.add_argument("--asset-delay", type=float, default=0.05, help="seconds before each asset is served")
+    args = parser.parse_args()
+    server = FixtureServer(port=args.port, delay=args.delay, assets=args.assets, asset_delay=args.asset_delay)
+    print(f"Serving {FIXTURES} on {server.url}")
+    server.httpd.serve_forever()
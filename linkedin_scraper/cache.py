@@ -0,0 +1,190 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from .person import Person
+from .company import Company
+from .jobs import Job
+from .urls import normalize_url
+
+DAY = 24 * 60 * 60
+
+
+class ScrapeCache(object):
+    """A SQLite backed cache of scraped `Person`, `Company` and `Job` objects.
+
+    Entries are keyed on the normalized LinkedIn url, expire after a per-type
+    TTL, and each type is trimmed back to its size limit, least recently used
+    first. A hit rebuilds the object from the stored dict, without a browser.
+    """
+
+    TYPES = {"person": Person, "company": Company, "job": Job}
+    DEFAULT_TTL = {"person": 7 * DAY, "company": 7 * DAY, "job": DAY}
+    DEFAULT_MAX_ENTRIES = {"person": 100000, "company": 20000, "job": 50000}
+    # last-access times are only rewritten this often, so hits stay read-only
+    TOUCH_INTERVAL = 60
+    # trimming to the size limit runs every this many writes per type
+    EVICT_EVERY = 100
+
+    def __init__(self, path=None, ttl=None, max_entries=None):
+        if path is None:
+            path = os.path.join(os.path.expanduser("~"), ".linkedin_scraper", "cache.sqlite")
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.ttl = dict(self.DEFAULT_TTL, **(ttl or {}))
+        self.max_entries = dict(self.DEFAULT_MAX_ENTRIES, **(max_entries or {}))
+
+        self._lock = threading.Lock()
+        self._writes = {kind: 0 for kind in self.TYPES}
+        self.connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            " kind TEXT NOT NULL, url TEXT NOT NULL, data TEXT NOT NULL,"
+            " created_at REAL NOT NULL, accessed_at REAL NOT NULL,"
+            " PRIMARY KEY (kind, url))"
+        )
+        self.connection.execute("CREATE INDEX IF NOT EXISTS entries_lru ON entries (kind, accessed_at)")
+
+    def _read(self, kind, key, now):
+        """`(data, expired)` for the entry under `key`, or None. Must be called with the lock held."""
+        row = self.connection.execute(
+            "SELECT data, created_at, accessed_at FROM entries WHERE kind = ? AND url = ?",
+            (kind, key)
+        ).fetchone()
+        if row is None:
+            return None
+        data, created_at, accessed_at = row
+        expired = now - created_at > self.ttl[kind]
+        if not expired and now - accessed_at > self.TOUCH_INTERVAL:
+            self.connection.execute(
+                "UPDATE entries SET accessed_at = ? WHERE kind = ? AND url = ?",
+                (now, kind, key)
+            )
+        return json.loads(data), expired
+
+    def entry(self, kind, url):
+        """Return `(data, expired)` for `url`, or None if it is missing. An expired entry is kept."""
+        with self._lock:
+            return self._read(kind, normalize_url(url), time.time())
+
+    def get(self, kind, url, include_expired=False):
+        """Return the stored dict for `url`, or None if it is missing or expired."""
+        key = normalize_url(url)
+        with self._lock:
+            entry = self._read(kind, key, time.time())
+            if entry is None:
+                return None
+            data, expired = entry
+            if expired and not include_expired:
+                self.connection.execute("DELETE FROM entries WHERE kind = ? AND url = ?", (kind, key))
+                return None
+        return data
+
+    def put(self, kind, url, data):
+        key = normalize_url(url)
+        now = time.time()
+        with self._lock:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO entries (kind, url, data, created_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                (kind, key, json.dumps(data), now, now)
+            )
+            self._writes[kind] += 1
+            if self._writes[kind] % self.EVICT_EVERY == 0:
+                self._evict(kind)
+
+    def touch(self, kind, url):
+        """Restart the TTL of `url`, for an entry confirmed to be still current."""
+        now = time.time()
+        with self._lock:
+            self.connection.execute(
+                "UPDATE entries SET created_at = ?, accessed_at = ? WHERE kind = ? AND url = ?",
+                (now, now, kind, normalize_url(url))
+            )
+
+    def _evict(self, kind):
+        self.connection.execute(
+            "DELETE FROM entries WHERE kind = ? AND created_at < ?",
+            (kind, time.time() - self.ttl[kind])
+        )
+        self.connection.execute(
+            "DELETE FROM entries WHERE kind = ? AND url IN ("
+            " SELECT url FROM entries WHERE kind = ? ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+            (kind, kind, self.max_entries[kind])
+        )
+
+    def evict(self):
+        with self._lock:
+            for kind in self.TYPES:
+                self._evict(kind)
+
+    def delete(self, kind, url):
+        with self._lock:
+            self.connection.execute("DELETE FROM entries WHERE kind = ? AND url = ?", (kind, normalize_url(url)))
+
+    def load(self, kind, url):
+        """Return the cached object for `url`, or None."""
+        data = self.get(kind, url)
+        if data is None:
+            return None
+        return self.TYPES[kind].from_dict(data)
+
+    def fetch(self, kind, url, refresh=False, scrape=None, **kwargs):
+        """Return the cached object for `url`, scraping and storing it on a miss.
+
+        With `refresh` the page is scraped even on a hit. If a fingerprint was
+        stored, even with an expired entry, it is passed on so an unchanged page
+        skips its expensive parts, and then the stored object is returned with
+        `unchanged` set and its TTL restarted. `kwargs` are passed to the
+        constructor, e.g. `driver`, or to `scrape` if given, which then builds
+        the object instead, e.g. on a driver it only takes on a miss.
+        """
+        entry = self.entry(kind, url)
+        previous, expired = entry if entry is not None else (None, True)
+        if previous is not None and not expired and not refresh:
+            return self.TYPES[kind].from_dict(previous)
+        if previous and previous.get("fingerprint"):
+            kwargs.setdefault("last_fingerprint", previous["fingerprint"])
+        if scrape is None:
+            obj = self.TYPES[kind](linkedin_url=url, **kwargs)
+        else:
+            obj = scrape(**kwargs)
+        if getattr(obj, "unchanged", False) and previous:
+            self.touch(kind, url)
+            cached = self.TYPES[kind].from_dict(previous)
+            cached.unchanged = True
+            return cached
+        self.store(kind, url, obj)
+        return obj
+
+    def store(self, kind, url, obj):
+        # a profile scraped with only some `sections` would be served as complete to later lookups
+        if getattr(obj, "partial", False) or getattr(obj, "unchanged", False):
+            return
+        data = obj.to_dict()
+        # don't keep empty results, e.g. from a run that was not logged in, for a whole TTL
+        if any(value for key, value in data.items() if key != "linkedin_url"):
+            self.put(kind, url, data)
+
+    def person(self, linkedin_url, **kwargs):
+        return self.fetch("person", linkedin_url, **kwargs)
+
+    def company(self, linkedin_url, **kwargs):
+        return self.fetch("company", linkedin_url, **kwargs)
+
+    def job(self, linkedin_url, **kwargs):
+        return self.fetch("job", linkedin_url, **kwargs)
+
+    def close(self):
+        with self._lock:
+            self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
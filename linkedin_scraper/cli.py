@@ -0,0 +1,365 @@
+"""Command line entry point, installed as `linkedin-scraper`.
+
+    linkedin-scraper crawl urls.txt --workers 8 --out results.jsonl
+    linkedin-scraper replay ~/.linkedin_scraper/snapshots --kind job --out jobs.jsonl
+
+Each worker process owns one Chrome and logs it in through a shared
+`SessionStore`, so only the first one fills in the login form. Results are
+written as JSON lines as they arrive. The first Ctrl-C stops handing out urls
+and lets the scrapes in flight finish, the second one stops right away.
+"""
+import argparse
+import getpass
+import json
+import os
+import signal
+import sys
+import time
+import urllib.parse
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing.util import Finalize
+
+from .company import Company
+from .driver_factory import create_driver
+from .instrumentation import percentile
+from .journal import CrawlJournal
+from .jobs import Job
+from .objects import Record, Scraper
+from .person import Person
+from .pool import is_alive
+from .ratelimit import RateLimiter
+from .selectors import DEFAULT_PATH as SELECTORS_PATH, SelectorRegistry
+from .session import SessionStore
+from .snapshots import PARSERS as SNAPSHOT_PARSERS, SnapshotStore, replay as replay_snapshots
+
+KINDS = ("person", "company", "job")
+
+# per worker process
+_worker = {}
+
+
+def guess_kind(url):
+    path = urllib.parse.urlsplit(url).path
+    if path.startswith("/in/"):
+        return "person"
+    if path.startswith("/company/"):
+        return "company"
+    if path.startswith("/jobs/view/"):
+        return "job"
+    return None
+
+
+def read_urls(path):
+    """Urls from a file (or stdin for "-"), one per line, skipping blank lines and # comments."""
+    f = sys.stdin if path == "-" else open(path, encoding="utf-8")
+    try:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith("#"):
+                yield line
+    finally:
+        if f is not sys.stdin:
+            f.close()
+
+
+def _new_driver():
+    options = _worker["options"]
+    driver = create_driver(headless=options["headless"], lightweight=options["lightweight"])
+    try:
+        SessionStore(options["session"]).login(
+            driver, options["email"], options["password"], cookie=options["cookie"]
+        )
+    except Exception:
+        driver.quit()
+        raise
+    return driver
+
+
+def _init_worker(options):
+    # the parent handles Ctrl-C and decides when the workers stop
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    # the scrapers print progress, keep it out of the results when they go to stdout
+    sys.stdout = sys.stderr
+    _worker["options"] = options
+    _worker["driver"] = None
+    if options["rate"]:
+        Scraper.RATE_LIMITER = RateLimiter(
+            rates={"*": (options["rate"], options["workers"])},
+            account=options["email"] or "default",
+            directory=options["rate_dir"],
+        )
+    if options["selectors"]:
+        Scraper.SELECTORS = SelectorRegistry(path=options["selectors"])
+    if options["snapshots"]:
+        Scraper.SNAPSHOTS = SnapshotStore(options["snapshots"])
+    Finalize(None, _quit_driver, exitpriority=16)
+
+
+def _quit_driver():
+    driver = _worker.get("driver")
+    if driver is not None:
+        Person.clear_connections_cache(driver)
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+
+def _scrape_one(kind, url):
+    if kind == "company" and _worker["options"]["company_http"]:
+        return Company(url, http=True)
+    if _worker["driver"] is None:
+        _worker["driver"] = _new_driver()
+    driver = _worker["driver"]
+    if kind == "person":
+        return Person(url, driver=driver, close_on_complete=False)
+    if kind == "company":
+        return Company(url, driver=driver, get_employees=_worker["options"]["employees"], close_on_complete=False)
+    return Job(url, driver=driver, close_on_complete=False)
+
+
+def _work(url, kind):
+    start = time.perf_counter()
+    result = {"url": url, "type": kind}
+    for attempt in range(_worker["options"]["retries"] + 1):
+        try:
+            result["data"] = _scrape_one(kind, url).materialize().to_dict()
+            result["ok"] = True
+            result.pop("error", None)
+            break
+        except Exception as e:
+            result["ok"] = False
+            result["error"] = repr(e)
+            driver = _worker["driver"]
+            if driver is None or is_alive(driver):
+                break
+            # the browser died, start a fresh one and try again
+            _quit_driver()
+            _worker["driver"] = None
+    result["seconds"] = round(time.perf_counter() - start, 3)
+    return result
+
+
+class _Interrupts(object):
+    """First SIGINT sets `stopping`, the second raises KeyboardInterrupt."""
+
+    def __init__(self):
+        self.stopping = False
+
+    def __call__(self, signum, frame):
+        if self.stopping:
+            raise KeyboardInterrupt
+        self.stopping = True
+        print("\nstopping after the scrapes in flight, press Ctrl-C again to quit now", file=sys.stderr)
+
+
+def crawl(args):
+    urls = list(read_urls(args.urls))
+    journal = None
+    if args.journal:
+        journal = CrawlJournal(args.journal)
+        journal.add(urls)
+        urls = journal.todo(max_attempts=args.max_attempts)
+
+    tasks = []
+    for url in urls:
+        kind = args.type or guess_kind(url)
+        if kind is None:
+            print(f"skipping {url}: can't tell its type, pass --type", file=sys.stderr)
+            continue
+        tasks.append((url, kind))
+
+    email = args.email or os.getenv("LINKEDIN_USER")
+    password = args.password or os.getenv("LINKEDIN_PASSWORD")
+    needs_browser = any(kind != "company" or not args.company_http for _, kind in tasks)
+    if needs_browser and not args.cookie and not (email and password):
+        # workers have no terminal to prompt on
+        if not SessionStore(args.session).is_valid():
+            email = input("Email: ")
+            password = getpass.getpass(prompt="Password: ")
+
+    options = {
+        "email": email,
+        "password": password,
+        "cookie": args.cookie,
+        "session": args.session,
+        "headless": not args.show_browser,
+        "lightweight": not args.full_browser,
+        "company_http": args.company_http,
+        "employees": args.employees,
+        "retries": args.retries,
+        "rate": args.rate,
+        "rate_dir": args.rate_dir,
+        "workers": args.workers,
+        "snapshots": args.snapshots,
+        "selectors": args.selectors,
+    }
+
+    out = sys.stdout if args.out == "-" else open(args.out, "a", encoding="utf-8")
+    interrupts = _Interrupts()
+    previous_handler = signal.signal(signal.SIGINT, interrupts)
+    latencies = []
+    succeeded = failed = 0
+    start = time.perf_counter()
+    # unlike multiprocessing.Pool, a worker that dies fails its futures with BrokenProcessPool instead of hanging
+    executor = ProcessPoolExecutor(args.workers, initializer=_init_worker, initargs=(options,))
+    try:
+        tasks = iter(tasks)
+        pending = {}
+        broken = False
+        # keep a couple of urls queued per worker so a stop can take effect quickly
+        while True:
+            while not interrupts.stopping and not broken and len(pending) < args.workers * 2:
+                task = next(tasks, None)
+                if task is None:
+                    break
+                if journal is not None:
+                    journal.start(task[0])
+                try:
+                    pending[executor.submit(_work, *task)] = task
+                except BrokenProcessPool:
+                    broken = True
+                    if journal is not None:
+                        journal.failed(task[0], "worker process died")
+            if not pending:
+                break
+            done, _ = wait(pending, timeout=0.5, return_when=FIRST_COMPLETED)
+            for future in done:
+                url, kind = pending.pop(future)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    if isinstance(e, BrokenProcessPool) and not broken:
+                        broken = True
+                        print("\na worker process died, failing the urls in flight and stopping", file=sys.stderr)
+                    result = {"url": url, "type": kind, "ok": False, "error": repr(e), "seconds": None}
+                out.write(json.dumps(result) + "\n")
+                out.flush()
+                if result["ok"]:
+                    succeeded += 1
+                    if journal is not None:
+                        journal.done(result["url"], result["data"])
+                else:
+                    failed += 1
+                    if journal is not None:
+                        journal.failed(result["url"], result["error"])
+                if result["seconds"] is not None:
+                    latencies.append(result["seconds"])
+        executor.shutdown()
+    except KeyboardInterrupt:
+        # the executor can't stop a running task, end the workers the way Pool.terminate did
+        processes = list((executor._processes or {}).values())
+        executor.shutdown(wait=False, cancel_futures=True)
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            process.join()
+    finally:
+        signal.signal(signal.SIGINT, previous_handler)
+        if journal is not None:
+            journal.close()
+        if out is not sys.stdout:
+            out.close()
+
+    elapsed = time.perf_counter() - start
+    print_summary(succeeded, failed, elapsed, latencies)
+    return 0 if failed == 0 and not interrupts.stopping else 1
+
+
+def print_summary(succeeded, failed, elapsed, latencies):
+    total = succeeded + failed
+    print(f"\n{total} urls in {elapsed:.1f}s: {succeeded} ok, {failed} failed", file=sys.stderr)
+    if elapsed > 0:
+        print(f"throughput  {total / elapsed * 60:.1f} urls/min", file=sys.stderr)
+    if latencies:
+        print(
+            "latency     "
+            + "  ".join(f"p{int(q * 100)} {percentile(latencies, q):.1f}s" for q in (0.5, 0.9, 0.99))
+            + f"  max {max(latencies):.1f}s",
+            file=sys.stderr
+        )
+
+
+def _plain(value):
+    if isinstance(value, Record):
+        return value.to_dict()
+    if isinstance(value, list):
+        return [_plain(item) for item in value]
+    if isinstance(value, dict):
+        return {key: _plain(item) for key, item in value.items()}
+    return value
+
+
+def replay(args):
+    store = SnapshotStore(args.directory)
+    out = sys.stdout if args.out == "-" else open(args.out, "a", encoding="utf-8")
+    succeeded = failed = 0
+    start = time.perf_counter()
+    try:
+        for result in replay_snapshots(store, kinds=args.kind, latest=not args.all, workers=args.workers):
+            snapshot = result.snapshot
+            line = {"url": snapshot.url, "kind": snapshot.kind, "fetched_at": snapshot.fetched_at,
+                    "digest": snapshot.digest, "ok": result.ok}
+            if result.ok:
+                line["data"] = _plain(result.value)
+                succeeded += 1
+            else:
+                line["error"] = repr(result.error)
+                failed += 1
+            out.write(json.dumps(line) + "\n")
+    finally:
+        store.close()
+        if out is not sys.stdout:
+            out.close()
+    elapsed = time.perf_counter() - start
+    print(f"\n{succeeded + failed} snapshots in {elapsed:.1f}s: {succeeded} ok, {failed} failed", file=sys.stderr)
+    return 0 if failed == 0 else 1
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="linkedin-scraper", description="Scrape LinkedIn profiles, companies and jobs")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    crawl_parser = commands.add_parser("crawl", help="scrape every url in a file with a pool of worker processes")
+    crawl_parser.add_argument("urls", help="file with one url per line, or - for stdin")
+    crawl_parser.add_argument("--type", choices=KINDS, help="what the urls are (default: guessed from each url)")
+    crawl_parser.add_argument("--workers", type=int, default=4, help="worker processes, each with its own Chrome")
+    crawl_parser.add_argument("--out", default="-", help="JSON lines file to append results to (default: stdout)")
+    crawl_parser.add_argument("--journal", help="crawl journal file, to resume an interrupted crawl")
+    crawl_parser.add_argument("--max-attempts", type=int, default=3, help="attempts per url across resumed runs")
+    crawl_parser.add_argument("--retries", type=int, default=1, help="retries on a fresh browser if one crashes")
+    crawl_parser.add_argument("--email", help="login email (default: $LINKEDIN_USER)")
+    crawl_parser.add_argument("--password", help="login password (default: $LINKEDIN_PASSWORD)")
+    crawl_parser.add_argument("--cookie", help="li_at cookie to log in with instead")
+    crawl_parser.add_argument("--session", help="session file shared by the workers (default: ~/.linkedin_scraper/session.json)")
+    crawl_parser.add_argument("--rate", type=float, help="page loads per minute across all workers")
+    crawl_parser.add_argument("--rate-dir", default=os.path.join(os.path.expanduser("~"), ".linkedin_scraper", "ratelimit"),
+                              help="where the workers share their rate limit state")
+    crawl_parser.add_argument("--company-http", action="store_true", help="fetch public company pages without a browser")
+    crawl_parser.add_argument("--employees", action="store_true", help="also walk company employees")
+    crawl_parser.add_argument("--show-browser", action="store_true", help="don't run Chrome headless")
+    crawl_parser.add_argument("--full-browser", action="store_true", help="load images, fonts and media too")
+    crawl_parser.add_argument("--selectors", default=SELECTORS_PATH,
+                              help="file the workers keep the working fallback selectors in, empty to keep them in memory")
+    crawl_parser.add_argument("--snapshots", help="directory to save the HTML of every page loaded that `replay` can parse")
+    crawl_parser.set_defaults(func=crawl)
+
+    replay_parser = commands.add_parser("replay", help="parse saved page snapshots again, without a browser")
+    replay_parser.add_argument("directory", help="snapshot directory written by `crawl --snapshots`")
+    replay_parser.add_argument("--kind", nargs="+", choices=sorted(SNAPSHOT_PARSERS),
+                               help="kinds of page to parse (default: all of them, only pages with a parser are recorded)")
+    replay_parser.add_argument("--all", action="store_true", help="parse every snapshot, not just the newest per url")
+    replay_parser.add_argument("--workers", type=int, help="parsing processes (default: one per CPU)")
+    replay_parser.add_argument("--out", default="-", help="JSON lines file to append results to (default: stdout)")
+    replay_parser.set_defaults(func=replay)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
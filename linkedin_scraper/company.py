@@ -1,18 +1,50 @@
 import requests
+import threading
 from lxml import html
-from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import NoSuchElementException
+from selenium.common.exceptions import WebDriverException
+from .driver_factory import create_driver
 from .objects import Scraper
 from .person import Person
+from . import parsers
+from . import scripts
+from . import waits
 import time
 import os
 import json
 
 AD_BANNER_CLASSNAME = ('ad-banner-container', '__ad')
 
+HTTP_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0 Safari/537.36",
+    "Accept": "text/html,application/xhtml+xml",
+    "Accept-Language": "en-US,en;q=0.9",
+}
+
+_http_session = None
+_http_session_lock = threading.Lock()
+
+
+def http_session(pool_size=100):
+    """A `requests.Session` keeping up to `pool_size` connections alive per host, for `Company(http=True)`."""
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update(HTTP_HEADERS)
+    return session
+
+
+def default_http_session():
+    global _http_session
+    with _http_session_lock:
+        if _http_session is None:
+            _http_session = http_session()
+        return _http_session
+
 def getchildren(elem):
     return elem.find_elements(By.XPATH, ".//*")
 
@@ -26,6 +58,9 @@ class CompanySummary(object):
         self.name = name
         self.followers = followers
 
+    def to_dict(self):
+        return {"linkedin_url": self.linkedin_url, "name": self.name, "followers": self.followers}
+
     def __repr__(self):
         if self.followers == None:
             return """ {name} """.format(name = self.name)
@@ -47,10 +82,14 @@ class Company(Scraper):
     showcase_pages = []
     affiliated_companies = []
     employees = []
+    employees_page = 0
     headcount = None
+    fingerprint = None
+    unchanged = False
 
-    def __init__(self, linkedin_url = None, name = None, about_us =None, website = None, phone = None, headquarters = None, founded = None, industry = None, company_type = None, company_size = None, specialties = None, showcase_pages =[], affiliated_companies = [], driver = None, scrape = True, get_employees = True, close_on_complete = True):
+    def __init__(self, linkedin_url = None, name = None, about_us =None, website = None, phone = None, headquarters = None, founded = None, industry = None, company_type = None, company_size = None, specialties = None, showcase_pages =[], affiliated_companies = [], driver = None, scrape = True, get_employees = True, close_on_complete = True, last_fingerprint = None, http = False, session = None):
         self.linkedin_url = linkedin_url
+        self.last_fingerprint = last_fingerprint
         self.name = name
         self.about_us = about_us
         self.website = website
@@ -64,18 +103,17 @@ class Company(Scraper):
         self.showcase_pages = showcase_pages
         self.affiliated_companies = affiliated_companies
 
-        if driver is None:
-            try:
-                if os.getenv("CHROMEDRIVER") == None:
-                    driver_path = os.path.join(os.path.dirname(__file__), 'drivers/chromedriver')
-                else:
-                    driver_path = os.getenv("CHROMEDRIVER")
+        if http:
+            # public page over plain HTTP, no browser at all
+            self.driver = None
+            if scrape:
+                self.scrape_public(session=session)
+            return
 
-                driver = webdriver.Chrome(driver_path)
-            except:
-                driver = webdriver.Chrome()
+        if driver is None:
+            driver = create_driver()
 
-        driver.get(linkedin_url)
+        self.load_page(linkedin_url, driver=driver)
         self.driver = driver
 
         if scrape:
@@ -88,18 +126,20 @@ class Company(Scraper):
         return self.__get_text_under_subtitle(driver.find_element(By.CLASS_NAME, class_name))
 
     def scrape(self, get_employees=True, close_on_complete=True):
-        if self.is_signed_in():
-            self.scrape_logged_in(get_employees = get_employees, close_on_complete = close_on_complete)
-        else:
-            self.scrape_not_logged_in(get_employees = get_employees, close_on_complete = close_on_complete)
+        with self.phase("company"):
+            if self.is_signed_in():
+                self.scrape_logged_in(get_employees = get_employees, close_on_complete = close_on_complete)
+            else:
+                self.scrape_not_logged_in(get_employees = get_employees, close_on_complete = close_on_complete)
 
     def __parse_employee__(self, employee_raw):
 
         try:
             # print()
             employee_object = {}
-            employee_object['name'] = (employee_raw.text.split("\n") or [""])[0].strip()
-            employee_object['designation'] = (employee_raw.text.split("\n") or [""])[3].strip()
+            lines = employee_raw.text.split("\n")
+            employee_object['name'] = (lines or [""])[0].strip()
+            employee_object['designation'] = (lines or [""])[3].strip()
             employee_object['linkedin_url'] = employee_raw.find_element(By.TAG_NAME, "a").get_attribute("href")
             # print(employee_raw.text, employee_object)
             # _person = Person(
@@ -118,73 +158,105 @@ class Company(Scraper):
             # print(e)
             return None
 
+    def _parse_employees(self, results_list, offset=0):
+        """Parse the employee cards in `results_list` from index `offset` on."""
+        if self.JS_EXTRACTION:
+            try:
+                return self.driver.execute_script(scripts.EMPLOYEE_CARDS, results_list, offset)
+            except WebDriverException as e:
+                print(f"Employee extraction script failed, falling back to selenium: {e}")
+        results_li = results_list.find_elements(By.TAG_NAME, "li")
+        return [self.__parse_employee__(res) for res in results_li[offset:]]
+
+    def _wait_for_employees(self, list_css):
+        self.settle(1, waits.count_is_stable((By.CSS_SELECTOR, "." + list_css + " li")))
+
     def get_employees(self, wait_time=10):
-        total = []
+        return list(self.iter_employees(wait_time=wait_time))
+
+    def iter_employees(self, wait_time=10, start_page=1):
+        """Yield employees as each page of the people tab is loaded.
+
+        `self.employees_page` is the last page whose employees have all been
+        yielded, so an interrupted run can pick up again with
+        `iter_employees(start_page=company.employees_page + 1)`. Pages before
+        `start_page` are still paged through, but not parsed.
+        """
         list_css = "list-style-none"
         next_xpath = '//button[@aria-label="Next"]'
         driver = self.driver
+        self.employees_page = start_page - 1
 
-        try:
-            see_all_employees = driver.find_element(By.XPATH,'//a[@data-control-name="topcard_see_all_employees"]')
-        except:
-            pass
-        driver.get(os.path.join(self.linkedin_url, "people"))
+        with self.phase("employees_page"):
+            try:
+                see_all_employees = driver.find_element(By.XPATH,'//a[@data-control-name="topcard_see_all_employees"]')
+            except:
+                pass
+            self.load_page(os.path.join(self.linkedin_url, "people"))
 
-        _ = WebDriverWait(driver, 3).until(EC.presence_of_all_elements_located((By.XPATH, '//span[@dir="ltr"]')))
+            _ = WebDriverWait(driver, 3).until(EC.presence_of_all_elements_located((By.XPATH, '//span[@dir="ltr"]')))
 
-        driver.execute_script("window.scrollTo(0, Math.ceil(document.body.scrollHeight/2));")
-        time.sleep(1)
-        driver.execute_script("window.scrollTo(0, Math.ceil(document.body.scrollHeight*3/4));")
-        time.sleep(1)
+            driver.execute_script("window.scrollTo(0, Math.ceil(document.body.scrollHeight/2));")
+            self._wait_for_employees(list_css)
+            driver.execute_script("window.scrollTo(0, Math.ceil(document.body.scrollHeight*3/4));")
+            self._wait_for_employees(list_css)
 
-        results_list = driver.find_element(By.CLASS_NAME, list_css)
-        results_li = results_list.find_elements(By.TAG_NAME, "li")
-        for res in results_li:
-            total.append(self.__parse_employee__(res))
+            results_list = driver.find_element(By.CLASS_NAME, list_css)
+            self.record_page(os.path.join(self.linkedin_url, "people"))
 
         def is_loaded(previous_results):
           loop = 0
           driver.execute_script("window.scrollTo(0, Math.ceil(document.body.scrollHeight));")
           results_li = results_list.find_elements(By.TAG_NAME, "li")
           while len(results_li) == previous_results and loop <= 5:
-            time.sleep(1)
+            self.settle(1, waits.count_above((By.TAG_NAME, "li"), previous_results, base=results_list))
             driver.execute_script("window.scrollTo(0, Math.ceil(document.body.scrollHeight));")
             results_li = results_list.find_elements(By.TAG_NAME, "li")
             loop += 1
           return loop <= 5
 
-        def get_data(previous_results):
-            results_li = results_list.find_elements(By.TAG_NAME, "li")
-            for res in results_li[previous_results:]:
-                total.append(self.__parse_employee__(res))
-
-        results_li_len = len(results_li)
-        while is_loaded(results_li_len):
-            try:
-                driver.find_element(By.XPATH,next_xpath).click()
-            except:
-                pass
-            _ = WebDriverWait(driver, wait_time).until(EC.presence_of_element_located((By.CLASS_NAME, list_css)))
-
-            driver.execute_script("window.scrollTo(0, Math.ceil(document.body.scrollHeight/2));")
-            time.sleep(1)
-            driver.execute_script("window.scrollTo(0, Math.ceil(document.body.scrollHeight*2/3));")
-            time.sleep(1)
-            driver.execute_script("window.scrollTo(0, Math.ceil(document.body.scrollHeight*3/4));")
-            time.sleep(1)
-            driver.execute_script("window.scrollTo(0, Math.ceil(document.body.scrollHeight));")
-            time.sleep(1)
-
-            get_data(results_li_len)
-            results_li_len = len(total)
-        return total
+        page = 1
+        results_li_len = 0
+        while True:
+            # the list keeps growing as pages load, only the cards after the previous page are new
+            with self.phase("employees_parse"):
+                if page >= start_page:
+                    employees = self._parse_employees(results_list, results_li_len)
+                else:
+                    employees = []
+                    results_li_len = len(results_list.find_elements(By.TAG_NAME, "li"))
+            for employee in employees:
+                results_li_len += 1
+                if employee is not None:
+                    yield employee
+            self.employees_page = max(self.employees_page, page)
+
+            with self.phase("employees_page"):
+                if not is_loaded(results_li_len):
+                    break
+                try:
+                    driver.find_element(By.XPATH,next_xpath).click()
+                except:
+                    pass
+                _ = WebDriverWait(driver, wait_time).until(EC.presence_of_element_located((By.CLASS_NAME, list_css)))
+
+                driver.execute_script("window.scrollTo(0, Math.ceil(document.body.scrollHeight/2));")
+                self._wait_for_employees(list_css)
+                driver.execute_script("window.scrollTo(0, Math.ceil(document.body.scrollHeight*2/3));")
+                self._wait_for_employees(list_css)
+                driver.execute_script("window.scrollTo(0, Math.ceil(document.body.scrollHeight*3/4));")
+                self._wait_for_employees(list_css)
+                driver.execute_script("window.scrollTo(0, Math.ceil(document.body.scrollHeight));")
+                self._wait_for_employees(list_css)
+                self.record_page(os.path.join(self.linkedin_url, "people"))
+            page += 1
 
 
 
     def scrape_logged_in(self, get_employees = True, close_on_complete = True):
         driver = self.driver
 
-        driver.get(self.linkedin_url)
+        self.load_page(self.linkedin_url)
 
         _ = WebDriverWait(driver, 3).until(EC.presence_of_all_elements_located((By.XPATH, '//div[@dir="ltr"]')))
 
@@ -192,6 +264,10 @@ class Company(Scraper):
 
         self.name = driver.find_element(By.CLASS_NAME,"org-top-card-summary__title").text.strip()
 
+        # an unchanged top card (which shows the employee count) means the employees walk can be skipped
+        self.fingerprint = self.page_fingerprint(scripts.COMPANY_FINGERPRINT)
+        self.unchanged = self.fingerprint is not None and self.fingerprint == self.last_fingerprint
+
         # Click About Tab or View All Link
         try:
           self.__find_first_available_element__(
@@ -199,10 +275,14 @@ class Company(Scraper):
             navigation.find_elements(By.XPATH, "//a[@data-control-name='org_about_module_see_all_view_link']"),
           ).click()
         except:
-          driver.get(os.path.join(self.linkedin_url, "about"))
+          self.load_page(os.path.join(self.linkedin_url, "about"))
 
         _ = WebDriverWait(driver, 3).until(EC.presence_of_all_elements_located((By.TAG_NAME, 'section')))
-        time.sleep(3)
+        self.settle(3, EC.all_of(
+            waits.document_ready,
+            EC.presence_of_element_located((By.CLASS_NAME, "org-about-module__margin-bottom")),
+        ))
+        self.record_page(os.path.join(self.linkedin_url, "about"))
 
         if 'Cookie Policy' in driver.find_elements(By.TAG_NAME, "section")[1].text or any(classname in driver.find_elements(By.TAG_NAME, "section")[1].get_attribute('class') for classname in AD_BANNER_CLASSNAME):
             section_id = 4
@@ -247,9 +327,9 @@ class Company(Scraper):
             grid = driver.find_element(By.CLASS_NAME, "mt1")
             spans = grid.find_elements(By.TAG_NAME, "span")
             for span in spans:
-                txt = span.text.strip()
-                if "See all" in txt and "employees on LinkedIn" in txt:
-                    self.headcount = int(txt.replace("See all", "").replace("employees on LinkedIn", "").strip())
+                headcount = parsers.parse_headcount(span.text.strip())
+                if headcount is not None:
+                    self.headcount = headcount
         except NoSuchElementException: # Does not exist in page, skip it
             pass
 
@@ -283,19 +363,43 @@ class Company(Scraper):
         except:
             pass
 
-        if get_employees:
+        if get_employees and not self.unchanged:
             self.employees = self.get_employees()
 
-        driver.get(self.linkedin_url)
+        self.load_page(self.linkedin_url)
 
         if close_on_complete:
             driver.close()
 
+    def scrape_public(self, session=None, timeout=10):
+        """Fetch the public company page over HTTP and parse it with lxml, without a browser.
+
+        Fills the same fields as `scrape_not_logged_in`. Showcase pages, affiliated
+        companies and employees are not on the public page and stay empty.
+        """
+        session = session or default_http_session()
+        with self.phase("company_public"):
+            if self.RATE_LIMITER is not None:
+                self.RATE_LIMITER.wait(self.linkedin_url)
+            response = session.get(self.linkedin_url, timeout=timeout)
+            # LinkedIn answers 999 to clients it does not want, and redirects logged out clients to the authwall
+            if response.status_code != 200 or "authwall" in response.url:
+                raise requests.HTTPError(
+                    f"Could not fetch the public page of {self.linkedin_url}: {response.status_code} {response.url}",
+                    response=response
+                )
+            self.record_page(self.linkedin_url, response.text, kind="company_public")
+            for field, value in parsers.parse_public_company(response.text).items():
+                setattr(self, field, value)
+        self.showcase_pages = []
+        self.affiliated_companies = []
+        self.employees = []
+
     def scrape_not_logged_in(self, close_on_complete = True, retry_limit = 10, get_employees = True):
         driver = self.driver
         retry_times = 0
         while self.is_signed_in() and retry_times <= retry_limit:
-            page = driver.get(self.linkedin_url)
+            self.load_page(self.linkedin_url)
             retry_times = retry_times + 1
 
         self.name = driver.find_element(By.CLASS_NAME, "name").text.strip()
@@ -346,11 +450,45 @@ class Company(Scraper):
         if get_employees:
             self.employees = self.get_employees()
 
-        driver.get(self.linkedin_url)
+        self.load_page(self.linkedin_url)
 
         if close_on_complete:
             driver.close()
 
+    def to_dict(self):
+        return {
+            "linkedin_url": self.linkedin_url,
+            "name": self.name,
+            "about_us": self.about_us,
+            "website": self.website,
+            "phone": self.phone,
+            "headquarters": self.headquarters,
+            "founded": self.founded,
+            "industry": self.industry,
+            "company_type": self.company_type,
+            "company_size": self.company_size,
+            "specialties": self.specialties,
+            "showcase_pages": [page.to_dict() for page in self.showcase_pages],
+            "affiliated_companies": [company.to_dict() for company in self.affiliated_companies],
+            "employees": self.employees,
+            "headcount": self.headcount,
+            "fingerprint": self.fingerprint,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """Rebuild a scraped Company from `to_dict` output without starting a browser."""
+        company = cls.__new__(cls)
+        company.driver = None
+        for key, value in data.items():
+            setattr(company, key, value)
+        company.showcase_pages = [CompanySummary(**page) for page in data.get("showcase_pages", [])]
+        company.affiliated_companies = [CompanySummary(**summary) for summary in data.get("affiliated_companies", [])]
+        company.employees = data.get("employees", [])
+        company.last_fingerprint = None
+        company.unchanged = False
+        return company
+
     def __repr__(self):
         _output = {}
         _output['name'] = self.name
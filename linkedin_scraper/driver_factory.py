@@ -0,0 +1,86 @@
+import os
+
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.service import Service
+
+# Requests the scrapers never parse: images, video, fonts, and analytics and ad trackers.
+BLOCKED_URLS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico",
+    "*.mp4", "*.webm", "*.m3u8", "*.mp3",
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot",
+    "*media.licdn.com*", "*dms.licdn.com*",
+    "*/li/track*", "*px.ads.linkedin.com*", "*snap.licdn.com*",
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*",
+    "*bat.bing.com*", "*connect.facebook.net*", "*ads.yahoo.com*",
+]
+
+_BUNDLED_CHROMEDRIVER = os.path.join(os.path.dirname(__file__), "drivers/chromedriver")
+
+
+def chromedriver_path():
+    """The chromedriver to use: `$CHROMEDRIVER`, then the bundled one, else None to let Selenium find it."""
+    path = os.getenv("CHROMEDRIVER")
+    if path:
+        return path
+    if os.path.isfile(_BUNDLED_CHROMEDRIVER):
+        return _BUNDLED_CHROMEDRIVER
+    return None
+
+
+def chrome_options(headless=True, lightweight=True, arguments=()):
+    options = Options()
+    if headless:
+        options.add_argument("--headless=new")
+    if lightweight:
+        # return from driver.get at DOMContentLoaded, every scraper waits for the elements it reads
+        options.page_load_strategy = "eager"
+        options.add_argument("--blink-settings=imagesEnabled=false")
+        options.add_argument("--mute-audio")
+        options.add_experimental_option("prefs", {
+            "profile.managed_default_content_settings.images": 2,
+            "profile.default_content_setting_values.notifications": 2,
+        })
+    for argument in arguments:
+        options.add_argument(argument)
+    return options
+
+
+def block_urls(driver, patterns=None):
+    """Block requests matching `patterns` (default `BLOCKED_URLS`) for every page `driver` loads.
+
+    The patterns only apply to the current tab, so they are kept on the driver as
+    `blocked_urls` for new tabs to block the same requests.
+    Returns False if the driver does not speak the Chrome DevTools protocol.
+    """
+    if not hasattr(driver, "execute_cdp_cmd"):
+        return False
+    patterns = list(BLOCKED_URLS if patterns is None else patterns)
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+    driver.blocked_urls = patterns
+    return True
+
+
+def create_driver(headless=True, lightweight=True, blocked_urls=None, arguments=(), options=None, driver_path=None):
+    """Start a Chrome driver for scraping.
+
+    With `lightweight` the page load strategy is `eager` and images, video,
+    fonts and trackers are blocked, which cuts page load time and the memory of
+    each browser. `blocked_urls` replaces the default `BLOCKED_URLS` patterns.
+    `options` replaces the generated Chrome options entirely.
+
+    `driver_path` defaults to `$CHROMEDRIVER`, and otherwise Selenium locates chromedriver itself.
+    """
+    if options is None:
+        options = chrome_options(headless=headless, lightweight=lightweight, arguments=arguments)
+    driver_path = driver_path or chromedriver_path()
+    service = Service(executable_path=driver_path) if driver_path else Service()
+    driver = webdriver.Chrome(service=service, options=options)
+    if lightweight:
+        try:
+            block_urls(driver, blocked_urls)
+        except Exception:
+            driver.quit()
+            raise
+    return driver
@@ -0,0 +1,71 @@
+import json
+import threading
+from dataclasses import asdict
+
+
+class JsonLinesSink(object):
+    """Write every phase event as one JSON object per line.
+
+    `Scraper.add_listener(JsonLinesSink("phases.jsonl"))`
+    """
+
+    def __init__(self, path, mode="a"):
+        self.path = path
+        self._file = open(path, mode, encoding="utf-8")
+        self._lock = threading.Lock()
+
+    def __call__(self, event):
+        line = json.dumps(asdict(event))
+        with self._lock:
+            self._file.write(line + "\n")
+            self._file.flush()
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class HistogramSink(object):
+    """Collect the duration and command count of every finished phase, per scraper and phase."""
+
+    def __init__(self):
+        self.durations = {}
+        self.commands = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, event):
+        if event.event != "end":
+            return
+        key = (event.scraper, event.phase)
+        with self._lock:
+            self.durations.setdefault(key, []).append(event.duration)
+            self.commands.setdefault(key, []).append(event.commands)
+
+    def summary(self):
+        with self._lock:
+            return {
+                f"{scraper}.{phase}": {
+                    "count": len(durations),
+                    "total": sum(durations),
+                    "mean": sum(durations) / len(durations),
+                    "p50": percentile(durations, 0.5),
+                    "p90": percentile(durations, 0.9),
+                    "max": max(durations),
+                    "commands_mean": sum(self.commands[(scraper, phase)]) / len(durations),
+                }
+                for (scraper, phase), durations in self.durations.items()
+            }
+
+    def __str__(self):
+        lines = [f"{'phase':<32}{'count':>7}{'total':>10}{'mean':>9}{'p50':>9}{'p90':>9}{'max':>9}{'commands':>10}"]
+        for name, row in sorted(self.summary().items(), key=lambda item: -item[1]["total"]):
+            lines.append(
+                f"{name:<32}{row['count']:>7}{row['total']:>9.2f}s{row['mean']:>8.2f}s"
+                f"{row['p50']:>8.2f}s{row['p90']:>8.2f}s{row['max']:>8.2f}s{row['commands_mean']:>10.1f}"
+            )
+        return "\n".join(lines)
@@ -2,24 +2,37 @@ import os
 from typing import List
 from time import sleep
 import urllib.parse
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 from .objects import Scraper
 from . import constants as c
 from .jobs import Job
+from . import scripts
+from . import selectors
+from . import parsers
+from . import waits
+from .tabs import JOB_READY, TabPool
+from .urls import job_id
 
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.wait import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.keys import Keys
+from selenium.common.exceptions import WebDriverException
 
 
 class JobSearch(Scraper):
     AREAS = ["recommended_jobs", None, "still_hiring", "more_jobs"]
+    LISTING_CLASS_NAMES = selectors.JOB_LISTING_CLASS_NAMES
+    CARD_CLASS_NAMES = selectors.JOB_CARD_CLASS_NAMES
+    # results per page, the step of the `start=` offset
+    PAGE_SIZE = 25
 
     def __init__(self, driver, base_url="https://www.linkedin.com/jobs/", close_on_complete=False, scrape=True, scrape_recommended_jobs=True):
         super().__init__()
         self.driver = driver
         self.base_url = base_url
+        self.hydration_errors = {}
 
         if scrape:
             self.scrape(close_on_complete, scrape_recommended_jobs)
@@ -57,12 +70,30 @@ class JobSearch(Scraper):
             return None
 
 
+    def _job_from_record(self, record) -> Job:
+        return Job(linkedin_url=record["linkedin_url"], job_title=record["title"], company=record["company"], location=record["location"], scrape=False, driver=self.driver)
+
+    def scrape_job_cards(self, job_cards) -> List[Job]:
+        """Scrape a list of job cards, in one script call when `JS_EXTRACTION` is on."""
+        if self.JS_EXTRACTION and job_cards:
+            try:
+                records = self.driver.execute_script(scripts.JOB_CARDS, job_cards)
+                return [self._job_from_record(record) for record in records if record]
+            except WebDriverException as e:
+                print(f"Job card extraction script failed, falling back to selenium: {e}")
+        job_results = []
+        for job_card in job_cards:
+            job = self.scrape_job_card(job_card)
+            if job:
+                job_results.append(job)
+        return job_results
+
     def scrape_logged_in(self, close_on_complete=True, scrape_recommended_jobs=True):
         driver = self.driver
-        driver.get(self.base_url)
+        self.load_page(self.base_url)
         if scrape_recommended_jobs:
             self.focus()
-            sleep(self.WAIT_FOR_ELEMENT_TIMEOUT)
+            self.settle(self.WAIT_FOR_ELEMENT_TIMEOUT, EC.presence_of_element_located((By.CLASS_NAME, "scaffold-finite-scroll__content")))
             job_area = self.wait_for_element_to_load(name="scaffold-finite-scroll__content", log=True)
             if not job_area:
                 print("Job area not found")
@@ -73,92 +104,161 @@ class JobSearch(Scraper):
                 area_name = self.AREAS[i]
                 if not area_name:
                     continue
-                area_results = []
                 # Updated from find_elements_by_class_name to find_elements(By.CLASS_NAME, ...)
-                for job_posting in area.find_elements(By.CLASS_NAME, "jobs-job-board-list__item"):
-                    job = self.scrape_job_card(job_posting)
-                    if job:
-                        area_results.append(job)
+                area_results = self.scrape_job_cards(area.find_elements(By.CLASS_NAME, "jobs-job-board-list__item"))
                 setattr(self, area_name, area_results)
         return
 
 
-    def search(self, search_term: str) -> List[Job]:
-        url = os.path.join(self.base_url, "search") + f"?keywords={urllib.parse.quote(search_term)}&refresh=true"
-        self.driver.get(url)
+    def _wait_for_search_results(self):
+        self.settle(self.WAIT_FOR_ELEMENT_TIMEOUT, EC.all_of(
+            waits.document_ready,
+            selectors.any_of_located(self.SELECTORS.candidates("job_search.listing")),
+        ))
+
+    def _wait_for_job_cards(self):
+        cards_css = ", ".join("." + class_name for class_name in self.CARD_CLASS_NAMES)
+        self.settle(1, waits.count_is_stable((By.CSS_SELECTOR, cards_css)))
+
+    def _search_url(self, search_term, location=None, start=0):
+        params = {"keywords": search_term}
+        if location:
+            params["location"] = location
+        if start:
+            params["start"] = start
+        params["refresh"] = "true"
+        return os.path.join(self.base_url, "search") + "?" + urllib.parse.urlencode(params, quote_via=urllib.parse.quote)
+
+    def search(self, search_term: str, hydrate=False, concurrency=4, pool=None) -> List[Job]:
+        """Return the jobs on the first results page for `search_term`.
+
+        With `hydrate`, their details are filled in too, see `hydrate`.
+        """
+        jobs = self._search_page(self._search_url(search_term))
+        if hydrate:
+            self.hydrate(jobs, concurrency=concurrency, pool=pool)
+        return jobs
+
+    def hydrate(self, jobs, concurrency=4, pool=None):
+        """Fill in the details of the `Job` stubs from a search, `concurrency` pages at a time.
+
+        Pages load in tabs of this search's driver, or with `pool` (a
+        `linkedin_scraper.pool.DriverPool`) on its drivers. Each job ID is fetched
+        once, even if it shows up in several stubs. A job that fails to load
+        keeps the fields from its card, and its error is kept in
+        `hydration_errors` by url. Returns the number of jobs filled in.
+        """
+        by_id = {}
+        for job in jobs:
+            by_id.setdefault(job_id(job.linkedin_url), []).append(job)
+        urls = {stubs[0].linkedin_url: stubs for stubs in by_id.values()}
+        self.hydration_errors = {}
+
+        with self.phase("hydrate"):
+            if pool is None:
+                with TabPool(self.driver, size=concurrency) as tabs:
+                    hydrated = self._apply_details(urls, (
+                        (result.url, *self._parse_job(result)) for result in tabs.map(urls, ready=JOB_READY)
+                    ))
+            else:
+                with ThreadPoolExecutor(max_workers=concurrency) as executor:
+                    futures = {executor.submit(self._fetch_job, pool, url): url for url in urls}
+                    hydrated = self._apply_details(urls, (
+                        (futures[future], None if future.exception() else future.result(), future.exception())
+                        for future in as_completed(futures)
+                    ))
+        print(f"Hydrated {hydrated} of {len(jobs)} jobs")
+        return hydrated
+
+    def _apply_details(self, urls, results):
+        hydrated = 0
+        for url, details, error in results:
+            if error is not None:
+                print(f"Could not hydrate {url}: {error!r}")
+                self.hydration_errors[url] = error
+                continue
+            for job in urls[url]:
+                for name, value in details.items():
+                    # keep what the card had when the page is missing a field
+                    if value is not None:
+                        setattr(job, name, value)
+                hydrated += 1
+        return hydrated
+
+    def _parse_job(self, result):
+        """`(details, error)` for the `TabResult` of a job page."""
+        if not result.ok:
+            return None, result.error
+        self.record_page(result.url, result.value)
+        try:
+            return parsers.parse_job(result.value), None
+        except Exception as e:
+            return None, e
+
+    def _fetch_job(self, pool, url):
+        with pool.driver() as driver:
+            self.load_page(url, driver=driver)
+            WebDriverWait(driver, self.WAIT_FOR_ELEMENT_TIMEOUT).until(EC.all_of(
+                *[EC.presence_of_element_located((By.CSS_SELECTOR, selector)) for selector in JOB_READY]
+            ))
+            page_source = driver.page_source
+            self.record_page(url, page_source)
+            return parsers.parse_job(page_source)
+
+    def iter_search(self, search_term, location=None, max_results=100):
+        """Yield the jobs found for `search_term`, walking the results pages until `max_results`.
+
+        Jobs are deduplicated by job ID, since promoted jobs show up again on
+        later pages. Stops early at the last page, or at a page with nothing new.
+        """
+        seen = set()
+        count = 0
+        start = 0
+        while count < max_results:
+            jobs = self._search_page(self._search_url(search_term, location, start))
+            new = 0
+            for job in jobs:
+                key = job_id(job.linkedin_url)
+                if key in seen:
+                    continue
+                seen.add(key)
+                new += 1
+                count += 1
+                yield job
+                if count >= max_results:
+                    return
+            if new == 0:
+                return
+            start += self.PAGE_SIZE
+
+    def _search_page(self, url) -> List[Job]:
+        self.load_page(url)
         self.scroll_to_bottom()
         self.focus()
-        sleep(self.WAIT_FOR_ELEMENT_TIMEOUT)
-
-        # Try multiple possible class names for job listings container
-        job_listing = None
-        possible_class_names = [
-            "jobs-search__job-details",
-            "scaffold-layout__detail",
-            "jobs-search-results-list",
-            "jobs-search-two-pane__details"
-        ]
-        
-        for class_name in possible_class_names:
-            print(f"Looking for job listing with class name: {class_name}")
-            job_listing = self.wait_for_element_to_load(name=class_name, timeout=3, log=True)
-            if job_listing:
-                print(f"Found job listing with class name: {class_name}")
-                break
-                
-        if not job_listing:
-            print("Could not find job listing container, trying XPath approach")
-            try:
-                # Try finding job details by a more specific XPath
-                job_listing = self.wait_for_element_to_load(
-                    by=By.XPATH, 
-                    name="//div[contains(@class, 'jobs-search__job-details') or contains(@class, 'jobs-details')]",
-                    timeout=5, 
-                    log=True
-                )
-            except:
-                print("XPath approach failed, returning empty results")
-                return []
+        self._wait_for_search_results()
 
+        # every fallback container at once, the one that worked last time first
+        job_listing = self.SELECTORS.find(self.driver, "job_search.listing", timeout=self.WAIT_FOR_ELEMENT_TIMEOUT, log=True)
         if not job_listing:
             print("Could not find job listings on the page")
             return []
             
         # Scroll through the page to load all job elements
         self.scroll_to_bottom()
-        sleep(1)
+        self._wait_for_job_cards()
         self.scroll_to_half()
-        sleep(1)
-        
-        # Try different selectors for job cards
-        job_cards = []
-        possible_card_selectors = [
-            "job-card-list",
-            "jobs-search-results__list-item",
-            "job-card-container",
-            "jobs-search-result-item"
-        ]
-        
-        for selector in possible_card_selectors:
-            cards = self.wait_for_all_elements_to_load(name=selector, base=self.driver, timeout=3, log=False, default=[])
-            if cards:
-                print(f"Found job cards with selector: {selector}")
-                job_cards = cards
-                break
-                
-        if not job_cards:
-            # Try finding job cards by XPath
-            try:
-                job_cards = self.driver.find_elements(By.XPATH, "//li[contains(@class, 'jobs-search-results__list-item')]")
-                print(f"Found {len(job_cards)} job cards by XPath")
-            except:
-                pass
-                
+        self._wait_for_job_cards()
+
+        # with snapshots on, the cards are parsed from the same page source that was saved
+        page_source = self.record_page(url)
         job_results = []
-        for job_card in job_cards:
-            job = self.scrape_job_card(job_card)
-            if job:
-                job_results.append(job)
+        if page_source is not None:
+            with self.phase("job_cards"):
+                job_results = [self._job_from_record(record) for record in parsers.parse_job_cards(page_source, url)]
+        if not job_results:
+            job_cards = self.SELECTORS.find_all(self.driver, "job_search.cards", timeout=3, log=True)
+            with self.phase("job_cards"):
+                job_results = self.scrape_job_cards(job_cards)
                 
         print(f"Found {len(job_results)} job results")
         return job_results
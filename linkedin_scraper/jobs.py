@@ -44,7 +44,8 @@ class Job(Scraper):
 
     def scrape(self, close_on_complete=True):
         if self.is_signed_in():
-            self.scrape_logged_in(close_on_complete=close_on_complete)
+            with self.phase("job"):
+                self.scrape_logged_in(close_on_complete=close_on_complete)
         else:
             raise NotImplemented("This part is not implemented yet")
 
@@ -61,11 +62,15 @@ class Job(Scraper):
             "benefits": self.benefits
         }
 
+    @classmethod
+    def from_dict(cls, data):
+        return cls(scrape=False, **data)
+
 
     def scrape_logged_in(self, close_on_complete=True):
         driver = self.driver
         
-        driver.get(self.linkedin_url)
+        self.load_page(self.linkedin_url)
         self.focus()
         self.job_title = self.wait_for_element_to_load(name="job-details-jobs-unified-top-card__job-title").text.strip()
         self.company = self.wait_for_element_to_load(name="job-details-jobs-unified-top-card__company-name").text.strip()
@@ -84,6 +89,7 @@ class Job(Scraper):
         job_description_elem = self.wait_for_element_to_load(name="jobs-description")
         job_description_elem.find_element(By.TAG_NAME, "button").click()
         self.job_description = job_description_elem.text.strip()
+        self.record_page(self.linkedin_url)
         try:
             self.benefits = self.wait_for_element_to_load(name="jobs-unified-description__salary-main-rail-card").text.strip()
         except TimeoutException:
@@ -0,0 +1,176 @@
+import json
+import sqlite3
+import threading
+import time
+
+from .pool import scrape_people
+from .urls import normalize_url
+
+PENDING = "pending"
+IN_FLIGHT = "in_flight"
+DONE = "done"
+FAILED = "failed"
+
+
+class CrawlJournal(object):
+    """A SQLite record of every url in a crawl, its state and its result, for resuming after a crash.
+
+    Each url is `pending`, `in_flight`, `done` or `failed`, with the number of
+    attempts so far and the serialized result or error. State changes are
+    buffered and written in one transaction every `batch_size` changes or
+    `flush_interval` seconds, so a crash can only lose the last batch, and
+    those urls are simply scraped again on resume.
+    """
+
+    def __init__(self, path, batch_size=100, flush_interval=5.0):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._buffer = []
+        self._flushed_at = time.monotonic()
+        self._lock = threading.Lock()
+        self.connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS urls ("
+            " url TEXT PRIMARY KEY, state TEXT NOT NULL, attempts INTEGER NOT NULL DEFAULT 0,"
+            " result TEXT, error TEXT, updated_at REAL NOT NULL)"
+        )
+        self.connection.execute("CREATE INDEX IF NOT EXISTS urls_state ON urls (state)")
+
+    def add(self, urls):
+        """Add `urls` as pending, ignoring any already in the journal. Returns how many were new."""
+        now = time.time()
+        with self._lock:
+            before = self.connection.total_changes
+            self.connection.execute("BEGIN")
+            self.connection.executemany(
+                "INSERT OR IGNORE INTO urls (url, state, updated_at) VALUES (?, ?, ?)",
+                ((normalize_url(url), PENDING, now) for url in urls)
+            )
+            self.connection.execute("COMMIT")
+            return self.connection.total_changes - before
+
+    def todo(self, max_attempts=3):
+        """Urls still to scrape: pending, or interrupted in flight or failed fewer than `max_attempts` times.
+
+        A url that takes its worker down with it is left in flight, so it counts as a failed attempt.
+        """
+        self.flush()
+        with self._lock:
+            rows = self.connection.execute(
+                "SELECT url FROM urls WHERE state = ? OR (state IN (?, ?) AND attempts < ?) ORDER BY rowid",
+                (PENDING, IN_FLIGHT, FAILED, max_attempts)
+            ).fetchall()
+        return [url for url, in rows]
+
+    def _record(self, statement, params):
+        with self._lock:
+            self._buffer.append((statement, params))
+            due = (
+                len(self._buffer) >= self.batch_size
+                or time.monotonic() - self._flushed_at >= self.flush_interval
+            )
+        if due:
+            self.flush()
+
+    def start(self, url):
+        self._record(
+            "UPDATE urls SET state = ?, attempts = attempts + 1, updated_at = ? WHERE url = ?",
+            (IN_FLIGHT, time.time(), normalize_url(url))
+        )
+
+    def done(self, url, result):
+        self._record(
+            "UPDATE urls SET state = ?, result = ?, error = NULL, updated_at = ? WHERE url = ?",
+            (DONE, json.dumps(result), time.time(), normalize_url(url))
+        )
+
+    def failed(self, url, error):
+        self._record(
+            "UPDATE urls SET state = ?, error = ?, updated_at = ? WHERE url = ?",
+            (FAILED, repr(error), time.time(), normalize_url(url))
+        )
+
+    def flush(self):
+        with self._lock:
+            buffer, self._buffer = self._buffer, []
+            self._flushed_at = time.monotonic()
+            if not buffer:
+                return
+            self.connection.execute("BEGIN")
+            for statement, params in buffer:
+                self.connection.execute(statement, params)
+            self.connection.execute("COMMIT")
+
+    def counts(self):
+        """Number of urls per state."""
+        self.flush()
+        with self._lock:
+            rows = self.connection.execute("SELECT state, COUNT(*) FROM urls GROUP BY state").fetchall()
+        return dict({PENDING: 0, IN_FLIGHT: 0, DONE: 0, FAILED: 0}, **dict(rows))
+
+    def results(self):
+        """Yield `(url, result)` for every finished url."""
+        self.flush()
+        with self._lock:
+            rows = self.connection.execute("SELECT url, result FROM urls WHERE state = ? ORDER BY rowid", (DONE,)).fetchall()
+        for url, result in rows:
+            yield url, json.loads(result)
+
+    def failures(self):
+        """Yield `(url, attempts, error)` for every url whose last attempt failed."""
+        self.flush()
+        with self._lock:
+            rows = self.connection.execute(
+                "SELECT url, attempts, error FROM urls WHERE state = ? ORDER BY rowid", (FAILED,)
+            ).fetchall()
+        yield from rows
+
+    def close(self):
+        self.flush()
+        with self._lock:
+            self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def crawl(journal, urls=None, max_attempts=3, **kwargs):
+    """Scrape the journal's unfinished urls with `scrape_people`, recording each result as it arrives.
+
+    `urls` are added to the journal first. Urls already done are skipped, and
+    failed ones are retried until they have been attempted `max_attempts`
+    times. `kwargs` are passed to `scrape_people`. Yields its `PoolResult`s.
+    """
+    if urls is not None:
+        journal.add(urls)
+
+    def todo():
+        # scrape_people pulls urls as workers free up, so each is marked in flight when it starts
+        for url in journal.todo(max_attempts=max_attempts):
+            journal.start(url)
+            yield url
+
+    try:
+        for result in scrape_people(todo(), **kwargs):
+            if result.ok:
+                journal.done(result.url, result.value.to_dict())
+            else:
+                journal.failed(result.url, result.error)
+            yield result
+    finally:
+        journal.flush()
+
+
+def resume(path, urls=None, max_attempts=3, **kwargs):
+    """Continue the crawl recorded at `path`, skipping finished urls and retrying failures.
+
+    Creates the journal if it does not exist yet, so the same call starts and resumes a batch.
+    """
+    with CrawlJournal(path) as journal:
+        yield from crawl(journal, urls, max_attempts=max_attempts, **kwargs)
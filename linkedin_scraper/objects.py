@@ -1,27 +1,74 @@
-from dataclasses import dataclass
-from time import sleep
+import hashlib
+import sys
+from contextlib import nullcontext
+from dataclasses import dataclass, fields, is_dataclass
+from time import sleep, perf_counter, time
 import logging
 
 from selenium.webdriver import Chrome
 from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.remote.webelement import WebElement
 
 from . import constants as c
+from .selectors import SelectorRegistry
 
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.wait import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 
+# Records are kept by the million for deduplication and analytics, so they get
+# __slots__ instead of a per-instance __dict__ where the Python version allows it.
+slotted_dataclass = dataclass(slots=True) if sys.version_info >= (3, 10) else dataclass
 
-@dataclass
-class Contact:
+_field_names = {}
+
+
+def plain(value):
+    """Return `value` with every WebElement in it replaced by its text, so it holds no browser reference.
+
+    Dataclass records are updated in place.
+    """
+    if isinstance(value, WebElement):
+        return value.text
+    if isinstance(value, (list, tuple)):
+        return [plain(item) for item in value]
+    if isinstance(value, dict):
+        return {key: plain(item) for key, item in value.items()}
+    if is_dataclass(value) and not isinstance(value, type):
+        for field in fields(value):
+            setattr(value, field.name, plain(getattr(value, field.name)))
+    return value
+
+
+class Record(object):
+    """Shallow, fast dict conversion for the scraped dataclasses, whose fields are plain values."""
+    __slots__ = ()
+
+    @classmethod
+    def field_names(cls):
+        names = _field_names.get(cls)
+        if names is None:
+            names = _field_names[cls] = tuple(field.name for field in fields(cls))
+        return names
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.field_names()}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**data)
+
+
+@slotted_dataclass
+class Contact(Record):
     name: str = None
     occupation: str = None
     url: str = None
 
 
-@dataclass
-class Institution:
+@slotted_dataclass
+class Institution(Record):
     institution_name: str = None
     linkedin_url: str = None
     website: str = None
@@ -32,7 +79,7 @@ class Institution:
     founded: int = None
 
 
-@dataclass
+@slotted_dataclass
 class Experience(Institution):
     from_date: str = None
     to_date: str = None
@@ -42,7 +89,7 @@ class Experience(Institution):
     location: str = None
 
 
-@dataclass
+@slotted_dataclass
 class Education(Institution):
     from_date: str = None
     to_date: str = None
@@ -50,15 +97,79 @@ class Education(Institution):
     degree: str = None
 
 
-@dataclass
+@slotted_dataclass
 class Interest(Institution):
-    title = None
+    title: str = None
 
 
-@dataclass
+@slotted_dataclass
 class Accomplishment(Institution):
-    category = None
-    title = None
+    category: str = None
+    title: str = None
+
+
+@dataclass
+class PhaseEvent:
+    event: str = None
+    scraper: str = None
+    phase: str = None
+    url: str = None
+    duration: float = None
+    commands: int = None
+    error: str = None
+    timestamp: float = None
+
+
+def count_commands(driver):
+    """Wrap `driver.execute` once so every WebDriver command bumps `driver.command_count`.
+
+    Element methods go through their parent driver's `execute`, so they are counted too.
+    """
+    if driver is None or hasattr(driver, "command_count"):
+        return
+    execute = driver.execute
+
+    def counting_execute(driver_command, params=None):
+        driver.command_count += 1
+        return execute(driver_command, params)
+
+    driver.command_count = 0
+    driver.execute = counting_execute
+
+
+class _Phase(object):
+
+    def __init__(self, scraper, name):
+        self.scraper = scraper
+        self.name = name
+
+    def _emit(self, event, **kwargs):
+        phase_event = PhaseEvent(
+            event=event,
+            scraper=type(self.scraper).__name__,
+            phase=self.name,
+            url=getattr(self.scraper, "linkedin_url", None),
+            timestamp=time(),
+            **kwargs
+        )
+        for listener in list(Scraper._listeners):
+            listener(phase_event)
+
+    def __enter__(self):
+        driver = self.scraper.driver
+        count_commands(driver)
+        self.commands = getattr(driver, "command_count", 0)
+        self._emit("start")
+        self.start = perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        duration = perf_counter() - self.start
+        commands = getattr(self.scraper.driver, "command_count", 0) - self.commands
+        self._emit("end", duration=duration, commands=commands, error=repr(exc) if exc else None)
+
+
+_NO_PHASE = nullcontext()
 
 
 @dataclass
@@ -66,11 +177,116 @@ class Scraper:
     driver: Chrome = None
     WAIT_FOR_ELEMENT_TIMEOUT = 5
     TOP_CARD = "pv-top-card"
+    # sleep the full fixed durations instead of waiting on readiness conditions
+    CONSERVATIVE_WAITS = False
+    # read list sections with one execute_script per page instead of per-card WebDriver calls
+    JS_EXTRACTION = True
+    SETTLE_POLL_FREQUENCY = 0.1
+    # callables receiving a PhaseEvent at the start and end of every scrape phase
+    _listeners = []
+    # a `linkedin_scraper.ratelimit.RateLimiter` every page load waits on, unless the driver has its own
+    RATE_LIMITER = None
+    # the fallback locators of each logical field, learning their order in memory unless given a path
+    SELECTORS = SelectorRegistry()
+    # a `linkedin_scraper.snapshots.SnapshotStore` every loaded page is saved to, for parsing again later
+    SNAPSHOTS = None
+
+    @staticmethod
+    def add_listener(listener):
+        Scraper._listeners.append(listener)
+
+    @staticmethod
+    def remove_listener(listener):
+        Scraper._listeners.remove(listener)
+
+    def phase(self, name):
+        """Context manager that reports the duration and WebDriver command count of a scrape phase.
+
+        Does nothing, and leaves the driver unwrapped, while no listener is registered.
+        """
+        if not Scraper._listeners:
+            return _NO_PHASE
+        return _Phase(self, name)
+
+    def __getstate__(self):
+        # pickled results must not drag the browser along
+        state = {key: plain(value) for key, value in self.__dict__.items()}
+        state["driver"] = None
+        return state
+
+    def materialize(self):
+        """Detach the result from the browser: drop the driver and turn any WebElement into its text.
+
+        Returns self, which can then be pickled, sent to another process or cached.
+        """
+        self.__dict__.update(self.__getstate__())
+        return self
+
+    def load_page(self, url, driver=None):
+        """Load `url`, first waiting on the driver's rate limiter or `RATE_LIMITER`."""
+        driver = driver or self.driver
+        limiter = getattr(driver, "rate_limiter", None) or self.RATE_LIMITER
+        if limiter is not None:
+            limiter.wait(url)
+        driver.get(url)
+
+    def record_page(self, url, page_source=None, kind=None, driver=None):
+        """Save the page to `SNAPSHOTS`, if set, reading `page_source` from the driver if not given.
+
+        Returns the page source, so a caller can parse the same string instead of
+        reading the page again, or None if snapshots are off or it could not be
+        read. A failure to save is printed and never stops the scrape.
+        """
+        if self.SNAPSHOTS is None:
+            return None
+        try:
+            if page_source is None:
+                page_source = (driver or self.driver).page_source
+            self.SNAPSHOTS.put(url, page_source, kind=kind)
+        except Exception as e:
+            print(f"Could not save a snapshot of {url}: {e}")
+        return page_source
+
+    def page_fingerprint(self, script):
+        """Hash the text `script` returns from the current page, or None if it returns nothing.
+
+        Whitespace is collapsed first, so re-rendering the same content gives the same fingerprint.
+        """
+        try:
+            material = self.driver.execute_script(script)
+        except Exception:
+            return None
+        if not material:
+            return None
+        return hashlib.sha1(" ".join(material.split()).encode("utf-8")).hexdigest()
 
     @staticmethod
     def wait(duration):
         sleep(int(duration))
 
+    def settle(self, duration, condition, timeout=None):
+        """Wait until the page is ready instead of sleeping a fixed duration.
+
+        Args:
+            duration: The fixed sleep used in conservative mode
+            condition: A callable taking the driver, see `linkedin_scraper.waits`
+            timeout: How long to wait for the condition (default: duration)
+
+        Returns:
+            The condition's value, or None if it was not met in time or in conservative mode
+        """
+        if self.CONSERVATIVE_WAITS:
+            sleep(duration)
+            return None
+        try:
+            return WebDriverWait(
+                self.driver,
+                timeout or duration,
+                poll_frequency=self.SETTLE_POLL_FREQUENCY
+            ).until(condition)
+        except TimeoutException:
+            return None
+
     def focus(self):
         self.driver.execute_script('alert("Focus window")')
         self.driver.switch_to.alert.accept()
@@ -0,0 +1,422 @@
+from lxml import html
+
+from .objects import Experience, Education, Interest, Accomplishment
+from .selectors import JOB_CARD_CLASS_NAMES
+from .urls import LINKEDIN_HOST
+
+
+def has_class(class_name):
+    """XPath predicate matching elements whose class list contains `class_name`."""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {class_name} ')"
+
+
+def children(element):
+    return element.xpath("./*")
+
+
+def first(elements, default=None):
+    return elements[0] if elements else default
+
+
+def text(element, separator=" "):
+    """Return the rendered text of an element.
+
+    Text inside `visually-hidden` nodes is skipped, since LinkedIn repeats every
+    label there for screen readers and Selenium's `.text` does not show it twice.
+    """
+    if element is None:
+        return ""
+    parts = element.xpath(
+        f".//text()[not(ancestor::*[{has_class('visually-hidden')}])]"
+    )
+    return separator.join(part.strip() for part in parts if part.strip())
+
+
+def span_text(element):
+    return text(first(element.xpath(".//span")))
+
+
+def split_work_times(work_times):
+    times = work_times.split("·")[0].strip() if work_times else ""
+    duration = work_times.split("·")[1].strip() if len(work_times.split("·")) > 1 else None
+    from_date = " ".join(times.split(" ")[:2]) if times else ""
+    to_date = " ".join(times.split(" ")[3:]) if times else ""
+    return from_date, to_date, duration
+
+
+def _details_list_items(page_source):
+    tree = html.fromstring(page_source)
+    main = first(tree.xpath("//main"))
+    if main is None:
+        return []
+    main_list = first(main.xpath(f".//*[{has_class('pvs-list__container')}]"))
+    if main_list is None:
+        return []
+    # only top level entries, positions nested under a company are parsed with their parent
+    return main_list.xpath(
+        f".//*[{has_class('pvs-list__paged-list-item')}]"
+        f"[not(ancestor::*[{has_class('pvs-list__paged-list-item')}])]"
+    )
+
+
+def _entity(item):
+    return first(item.xpath(".//div[@data-view-name='profile-component-entity']"))
+
+
+def parse_experiences(page_source):
+    """Parse the `details/experience` page of a profile into `Experience` objects."""
+    experiences = []
+    for item in _details_list_items(page_source):
+        position = _entity(item)
+        if position is None or len(children(position)) < 2:
+            continue
+        company_logo_elem, position_details = children(position)[:2]
+
+        company_linkedin_url = first(company_logo_elem.xpath("./*/@href"))
+        if not company_linkedin_url:
+            continue
+
+        position_details_list = children(position_details)
+        position_summary_details = first(position_details_list)
+        position_summary_text = position_details_list[1] if len(position_details_list) > 1 else None
+        if position_summary_details is None or not children(position_summary_details):
+            continue
+        outer_positions = children(children(position_summary_details)[0])
+        if not outer_positions:
+            continue
+
+        if len(outer_positions) == 4:
+            position_title = span_text(outer_positions[0])
+            company = span_text(outer_positions[1])
+            work_times = span_text(outer_positions[2])
+            location = span_text(outer_positions[3])
+        elif len(outer_positions) == 3:
+            if "·" in text(outer_positions[2]):
+                position_title = span_text(outer_positions[0])
+                company = span_text(outer_positions[1])
+                work_times = span_text(outer_positions[2])
+                location = ""
+            else:
+                position_title = ""
+                company = span_text(outer_positions[0])
+                work_times = span_text(outer_positions[1])
+                location = span_text(outer_positions[2])
+        else:
+            position_title = ""
+            company = span_text(outer_positions[0])
+            work_times = ""
+            location = ""
+
+        from_date, to_date, duration = split_work_times(work_times)
+
+        inner_positions = []
+        if position_summary_text is not None:
+            inner_positions = position_summary_text.xpath(
+                f".//*[{has_class('pvs-list__container')}]//*[{has_class('pvs-list__paged-list-item')}]"
+            )
+
+        if len(inner_positions) > 1:
+            for inner_position in inner_positions:
+                res = children(first(inner_position.xpath(".//a"), inner_position))
+                position_title_elem = res[0] if len(res) > 0 else None
+                work_times_elem = res[1] if len(res) > 1 else None
+                location_elem = res[2] if len(res) > 2 else None
+
+                location = text(first(children(location_elem))) if location_elem is not None else None
+                position_title = span_text(position_title_elem) if position_title_elem is not None else ""
+                work_times = text(first(children(work_times_elem))) if work_times_elem is not None else ""
+                from_date, to_date, duration = split_work_times(work_times)
+
+                experiences.append(Experience(
+                    position_title=position_title,
+                    from_date=from_date,
+                    to_date=to_date,
+                    duration=duration,
+                    location=location,
+                    description=text(inner_position, "\n"),
+                    institution_name=company,
+                    linkedin_url=company_linkedin_url
+                ))
+        else:
+            experiences.append(Experience(
+                position_title=position_title,
+                from_date=from_date,
+                to_date=to_date,
+                duration=duration,
+                location=location,
+                description=text(position_summary_text, "\n"),
+                institution_name=company,
+                linkedin_url=company_linkedin_url
+            ))
+    return experiences
+
+
+def parse_educations(page_source):
+    """Parse the `details/education` page of a profile into `Education` objects."""
+    educations = []
+    for item in _details_list_items(page_source):
+        position = _entity(item)
+        if position is None or len(children(position)) < 2:
+            continue
+        institution_logo_elem, position_details = children(position)[:2]
+
+        institution_linkedin_url = first(institution_logo_elem.xpath("./*/@href"))
+
+        position_details_list = children(position_details)
+        position_summary_details = first(position_details_list)
+        position_summary_text = position_details_list[1] if len(position_details_list) > 1 else None
+        if position_summary_details is None or not children(position_summary_details):
+            continue
+        outer_positions = children(children(position_summary_details)[0])
+        if not outer_positions:
+            continue
+
+        institution_name = span_text(outer_positions[0])
+        degree = span_text(outer_positions[1]) if len(outer_positions) > 1 else None
+
+        from_date = None
+        to_date = None
+        if len(outer_positions) > 2:
+            times = span_text(outer_positions[2])
+            if times != "":
+                words = times.split(" ")
+                from_date = words[words.index("-") - 1] if len(words) > 3 and "-" in words else words[0]
+                to_date = words[-1]
+
+        educations.append(Education(
+            from_date=from_date,
+            to_date=to_date,
+            description=text(position_summary_text, "\n"),
+            degree=degree,
+            institution_name=institution_name,
+            linkedin_url=institution_linkedin_url
+        ))
+    return educations
+
+
+def _text_under_subtitle(element):
+    """The text of an element after its first line, which is the subtitle."""
+    if element is None:
+        return None
+    return "\n".join(text(element, "\n").split("\n")[1:])
+
+
+def parse_public_company(page_source):
+    """Parse the public (logged out) company page into the fields `Company.scrape_not_logged_in` reads.
+
+    Returns a dict, with None for fields missing from the page.
+    """
+    tree = html.fromstring(page_source)
+
+    def by_class(class_name):
+        return first(tree.xpath(f"//*[{has_class(class_name)}]"))
+
+    def plain(class_name):
+        element = by_class(class_name)
+        return text(element) if element is not None else None
+
+    return {
+        "name": plain("name"),
+        "about_us": plain("basic-info-description"),
+        "specialties": _text_under_subtitle(by_class("specialties")),
+        "website": _text_under_subtitle(by_class("website")),
+        "phone": _text_under_subtitle(by_class("phone")),
+        "headquarters": plain("adr"),
+        "industry": plain("industry"),
+        "company_size": plain("company-size"),
+        "company_type": _text_under_subtitle(by_class("type")),
+        "founded": _text_under_subtitle(by_class("founded")),
+    }
+
+
+def parse_job(page_source):
+    """Parse a job posting page into the fields `Job.scrape_logged_in` reads.
+
+    Returns a dict, with None for fields missing from the page.
+    """
+    tree = html.fromstring(page_source)
+
+    def by_class(class_name):
+        return first(tree.xpath(f"//*[{has_class(class_name)}]"))
+
+    def plain(class_name):
+        element = by_class(class_name)
+        return text(element) if element is not None else None
+
+    company = by_class("job-details-jobs-unified-top-card__company-name")
+    primary_description = by_class("job-details-jobs-unified-top-card__primary-description-container")
+    texts = []
+    if primary_description is not None:
+        texts = [text(span) for span in primary_description.xpath(".//span") if text(span)]
+    # the "See more" button is not part of the description
+    description = by_class("jobs-description__content")
+    if description is None:
+        description = by_class("jobs-description")
+
+    return {
+        "job_title": plain("job-details-jobs-unified-top-card__job-title"),
+        "company": text(company) if company is not None else None,
+        "company_linkedin_url": first(company.xpath(".//a/@href")) if company is not None else None,
+        "location": texts[0] if texts else None,
+        "posted_date": texts[3] if len(texts) > 3 else None,
+        "applicant_count": plain("jobs-unified-top-card__applicant-count") or 0,
+        "job_description": text(description, "\n") if description is not None else None,
+        "benefits": plain("jobs-unified-description__salary-main-rail-card"),
+    }
+
+
+def parse_job_cards(page_source, base_url=f"https://{LINKEDIN_HOST}/"):
+    """Parse the cards of a job search results page into the records `scripts.JOB_CARDS` returns.
+
+    Relative job links are resolved against `base_url`.
+    """
+    tree = html.fromstring(page_source, base_url=base_url)
+    tree.make_links_absolute(base_url)
+    cards = []
+    # the first card class that matches, as `JobSearch` looks them up
+    for class_name in JOB_CARD_CLASS_NAMES:
+        cards = tree.xpath(f"//*[{has_class(class_name)}]")
+        if cards:
+            break
+    records = []
+    for card in cards:
+        link = first(card.xpath(f".//*[{has_class('job-card-list__title--link')}]"))
+        company = first(card.xpath(f".//*[{has_class('artdeco-entity-lockup__subtitle')}]"))
+        location = first(card.xpath(f".//*[{has_class('job-card-container__metadata-wrapper')}]"))
+        if link is None or company is None or location is None:
+            continue
+        records.append({
+            "title": text(link),
+            "linkedin_url": link.get("href"),
+            "company": text(company),
+            "location": text(location),
+        })
+    return records
+
+
+def parse_people_cards(page_source):
+    """Parse the profile urls, without their query string, off a people search results page."""
+    tree = html.fromstring(page_source)
+    results = first(tree.xpath(f"//*[{has_class('search-marvel-srp')}]/div/div/div/ul[1]"))
+    if results is None:
+        return []
+    urls = []
+    for card in results.xpath(".//li"):
+        href = first(card.xpath(f".//*[{has_class('mb1')}]//a/@href"))
+        if href:
+            urls.append(href.split("?")[0])
+    return urls
+
+
+def parse_profile(page_source):
+    """Parse the profile page into the fields `Person` reads from it.
+
+    Returns a dict with `name`, `location`, `about`, `open_to_work`, and the
+    `interests` and `accomplishments` as records.
+    """
+    tree = html.fromstring(page_source)
+    top_panel = first(tree.xpath("//*[@class='mt2 relative']"))
+    location = first(tree.xpath("//*[@class='text-body-small inline t-black--light break-words']"))
+    about_anchor = first(tree.xpath("//*[@id='about']"))
+    about = None
+    if about_anchor is not None:
+        about = first(about_anchor.getparent().xpath(f".//*[{has_class('display-flex')}]"))
+    picture_title = first(tree.xpath(f"//*[{has_class('pv-top-card-profile-picture')}]//img/@title")) or ""
+
+    interests = [
+        Interest(title=text(first(entity.xpath(".//h3"))))
+        for entity in tree.xpath("//*[@class='pv-interest-entity pv-profile-section__card-item ember-view']")
+    ]
+    accomplishments = []
+    for block in tree.xpath("//div[@class='pv-accomplishments-block__content break-words']"):
+        category = text(first(block.xpath(".//h3")))
+        for title in block.xpath(".//ul//li"):
+            accomplishments.append(Accomplishment(category=category, title=text(title)))
+
+    return {
+        "name": text(first(top_panel.xpath(".//h1"))) if top_panel is not None else None,
+        "location": text(location) if location is not None else None,
+        "about": text(about, "\n") if about is not None else None,
+        "open_to_work": "#OPEN_TO_WORK" in picture_title,
+        "interests": interests,
+        "accomplishments": accomplishments,
+    }
+
+
+# the `dt` labels of the company about page and the field each one fills
+_COMPANY_ABOUT_LABELS = {
+    "Website": "website",
+    "Phone": "phone",
+    "Industry": "industry",
+    "Company size": "company_size",
+    "Headquarters": "headquarters",
+    "Type": "company_type",
+    "Founded": "founded",
+    "Specialties": "specialties",
+}
+
+
+def parse_headcount(span_text):
+    """The employee count of a "See all 1,234 employees on LinkedIn" link, or None for any other text."""
+    if "See all" not in span_text or "employees on LinkedIn" not in span_text:
+        return None
+    count = span_text.replace("See all", "").replace("employees on LinkedIn", "").strip()
+    try:
+        return int(count.replace(",", "").replace(".", "").replace("\u202f", "").replace("\xa0", ""))
+    except ValueError:
+        return None
+
+
+def parse_company_about(page_source):
+    """Parse the logged-in company about page into the fields `Company.scrape_logged_in` reads.
+
+    Returns a dict, with None for fields missing from the page.
+    """
+    tree = html.fromstring(page_source)
+    details = dict.fromkeys(_COMPANY_ABOUT_LABELS.values())
+    title = first(tree.xpath(f"//*[{has_class('org-top-card-summary__title')}]"))
+    details["name"] = text(title) if title is not None else None
+    details["headcount"] = None
+    for span in tree.xpath(f"//*[{has_class('mt1')}]//span"):
+        headcount = parse_headcount(text(span))
+        if headcount is not None:
+            details["headcount"] = headcount
+
+    grid = first(tree.xpath(f"//*[{has_class('org-about-module__margin-bottom')}]"))
+    if grid is None:
+        details["about_us"] = None
+        return details
+    details["about_us"] = text(first(grid.xpath(".//p"))) or None
+    labels = grid.xpath(".//dt")
+    values = grid.xpath(".//dd")
+    # company size is followed by an extra dd with the member count, which shifts the values after it
+    offset = 0
+    for i, label in enumerate(labels[:min(len(labels), len(values))]):
+        label = text(label)
+        if i + offset >= len(values):
+            break
+        value = text(values[i + offset])
+        field = _COMPANY_ABOUT_LABELS.get(label)
+        if field == "specialties":
+            value = "\n".join(value.split(", "))
+        if field is not None:
+            details[field] = value
+        if field == "company_size" and len(values) > len(labels):
+            offset = 1
+    return details
+
+
+def parse_employees(page_source):
+    """Parse the employee cards of a company people page into the records `scripts.EMPLOYEE_CARDS` returns."""
+    tree = html.fromstring(page_source)
+    results = first(tree.xpath(f"//*[{has_class('list-style-none')}]"))
+    if results is None:
+        return []
+    employees = []
+    for card in results.xpath(".//li"):
+        lines = text(card, "\n").split("\n")
+        link = first(card.xpath(".//a/@href"))
+        if len(lines) < 4 or not link:
+            continue
+        employees.append({"name": lines[0], "designation": lines[3], "linkedin_url": link})
+    return employees
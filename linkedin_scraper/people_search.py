@@ -1,17 +1,27 @@
 import os
+import random
 from typing import List
 from time import sleep
 import urllib.parse
 
 from .objects import Scraper
 from .jobs import Job
+from . import parsers
+from . import scripts
+from . import waits
+from .urls import normalize_url
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.wait import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.keys import Keys
+from selenium.common.exceptions import WebDriverException
 
 class PeopleSearch(Scraper):
     AREAS = ["recommended_jobs", None, "still_hiring", "more_jobs"]
+    PEOPLE_LIST_CLASS_NAME = "search-marvel-srp"
+    PEOPLE_CARDS_CSS = ".search-marvel-srp>div>div>div>ul:first-of-type"
+    # fraction of search result cards whose outerHTML is printed, for debugging selectors
+    DEBUG_SAMPLE_RATE = 0.0
 
     def __init__(self, driver, base_url="https://www.linkedin.com/", close_on_complete=False, scrape=True, scrape_recommended_jobs=True):
         super().__init__()
@@ -30,24 +40,65 @@ class PeopleSearch(Scraper):
 
 
     def scrape_people_card(self, base_element) -> Job:
-        print(f"[DEBUG] scrape_people_card called on element: {base_element}")
         # Use CSS selector to find the link directly
         people_link = self.wait_for_element_to_load(by=By.CSS_SELECTOR, name=".mb1 a", base=base_element)
         if people_link:
-            url = people_link.get_attribute("href").split("?")[0]
-            print(f"[DEBUG] Found profile link: {url}")
-            return url
-        else:
-            print(f"[DEBUG] No profile link found in element")
+            return people_link.get_attribute("href").split("?")[0]
+        return None
+
+    def _debug_sampled(self):
+        return self.DEBUG_SAMPLE_RATE > 0 and random.random() < self.DEBUG_SAMPLE_RATE
+
+
+    def scrape_people_cards(self, people_cards) -> List[str]:
+        """Return the profile urls of a list of people cards, in one script call when `JS_EXTRACTION` is on."""
+        if self.JS_EXTRACTION and people_cards:
+            try:
+                records = self.driver.execute_script(scripts.PEOPLE_CARDS, people_cards)
+                return [record["linkedin_url"] for record in records if record]
+            except WebDriverException as e:
+                print(f"People card extraction script failed, falling back to selenium: {e}")
+
+        people_profiles = []
+        for people_card in people_cards:
+            people = self.scrape_people_card(people_card)
+            if people:
+                people_profiles.append(people)
+        return people_profiles
+
+    def _people_cards(self):
+        """The card elements of the results list, or None if there is no list."""
+        # First get the first ul element
+        first_ul = self.wait_for_element_to_load(
+            by=By.CSS_SELECTOR,
+            name=self.PEOPLE_CARDS_CSS,
+            base=self.driver
+        )
+        if first_ul is None:
             return None
+        # Then get all li elements inside that ul
+        return first_ul.find_elements(By.TAG_NAME, "li")
 
+    def _dump_sampled_cards(self, people_cards):
+        """Print the outerHTML of a `DEBUG_SAMPLE_RATE` sample of `people_cards`."""
+        if self.DEBUG_SAMPLE_RATE <= 0:
+            return
+        for i, people_card in enumerate(people_cards):
+            # the full card markup is large, only dump a sample of cards when asked to
+            if not self._debug_sampled():
+                continue
+            try:
+                html_content = people_card.get_attribute('outerHTML')
+                print(f"\n{'='*40}\n[HTML DEBUG] CARD {i+1} HTML:\n{'='*40}\n{html_content}\n{'='*40}\n")
+            except Exception as e:
+                print(f"[ERROR] Failed to get HTML for card {i+1}: {str(e)}")
 
     def scrape_logged_in(self, close_on_complete=True, scrape_recommended_jobs=True):
         driver = self.driver
-        driver.get(self.base_url)
+        self.load_page(self.base_url)
         if scrape_recommended_jobs:
             self.focus()
-            sleep(self.WAIT_FOR_ELEMENT_TIMEOUT)
+            self.settle(self.WAIT_FOR_ELEMENT_TIMEOUT, EC.presence_of_element_located((By.CLASS_NAME, "scaffold-finite-scroll__content")))
             job_area = self.wait_for_element_to_load(name="scaffold-finite-scroll__content")
             areas = self.wait_for_all_elements_to_load(name="artdeco-card", base=job_area)
             for i, area in enumerate(areas):
@@ -62,52 +113,70 @@ class PeopleSearch(Scraper):
         return
 
 
-    def search(self, search_term: str) -> List[Job]:
-        url = os.path.join(self.base_url, "search/results/people/") + f"?keywords={urllib.parse.quote(search_term)}&refresh=true"
-        self.driver.get(url)
-        self.scroll_to_bottom()
-        #self.focus()
-        sleep(self.WAIT_FOR_ELEMENT_TIMEOUT)
+    def _wait_for_people_cards(self):
+        self.settle(self.WAIT_FOR_ELEMENT_TIMEOUT, waits.count_is_stable((By.CSS_SELECTOR, self.PEOPLE_CARDS_CSS + " li")))
 
-        people_list_class_name = "search-marvel-srp"
-        job_listing = self.wait_for_element_to_load(name=people_list_class_name)
+    def _search_url(self, search_term, page=1):
+        params = {"keywords": search_term}
+        if page > 1:
+            params["page"] = page
+        params["refresh"] = "true"
+        return os.path.join(self.base_url, "search/results/people/") + "?" + urllib.parse.urlencode(params, quote_via=urllib.parse.quote)
 
-        self.scroll_class_name_element_to_page_percent(people_list_class_name, 0.3)
-        #self.focus()
-        sleep(self.WAIT_FOR_ELEMENT_TIMEOUT)
+    def search(self, search_term: str) -> List[str]:
+        """The normalized profile urls on the first results page for `search_term`."""
+        return list(self.iter_search(search_term, pages=1))
 
-        self.scroll_class_name_element_to_page_percent(people_list_class_name, 0.6)
-        #self.focus()
-        sleep(self.WAIT_FOR_ELEMENT_TIMEOUT)
+    def iter_search(self, search_term, pages=10):
+        """Yield the normalized profile urls found for `search_term`, over up to `pages` results pages.
 
-        self.scroll_class_name_element_to_page_percent(people_list_class_name, 1)
+        Each url is yielded once. Stops early at a page with no new profiles.
+        """
+        seen = set()
+        for page in range(1, pages + 1):
+            new = 0
+            for url in self._search_page(self._search_url(search_term, page)):
+                url = normalize_url(url)
+                if url in seen:
+                    continue
+                seen.add(url)
+                new += 1
+                yield url
+            if new == 0:
+                return
+
+    def _search_page(self, url) -> List[str]:
+        self.load_page(url)
+        self.scroll_to_bottom()
         #self.focus()
-        sleep(self.WAIT_FOR_ELEMENT_TIMEOUT)
+        self.settle(self.WAIT_FOR_ELEMENT_TIMEOUT, EC.all_of(
+            waits.document_ready,
+            EC.presence_of_element_located((By.CLASS_NAME, self.PEOPLE_LIST_CLASS_NAME)),
+        ))
 
-        people_profiles = []
-        # First get the first ul element
-        first_ul = self.wait_for_element_to_load(
-            by=By.CSS_SELECTOR,
-            name=".search-marvel-srp>div>div>div>ul:first-of-type", 
-            base=self.driver
-        )
-        # Then get all li elements inside that ul
-        people_cards = first_ul.find_elements(By.TAG_NAME, "li")
-        print(f"[DEBUG] Found {len(people_cards)} people card containers")
-        
-        for i, people_card in enumerate(people_cards):
-            print(f"[DEBUG] Processing people card {i+1}/{len(people_cards)}")
-            
-            # Log HTML content of the card
-            try:
-                html_content = people_card.get_attribute('outerHTML')
-                print(f"\n{'='*40}\n[HTML DEBUG] CARD {i+1} HTML:\n{'='*40}\n{html_content}\n{'='*40}\n")
-            except Exception as e:
-                print(f"[ERROR] Failed to get HTML for card {i+1}: {str(e)}")
-            
-            people = self.scrape_people_card(people_card)
-            if people:
-                people_profiles.append(people)
-        
-        print(f"[DEBUG] Total profiles collected: {len(people_profiles)}")
+        people_list_class_name = self.PEOPLE_LIST_CLASS_NAME
+        job_listing = self.wait_for_element_to_load(name=people_list_class_name)
+
+        for page_percent in (0.3, 0.6, 1):
+            self.scroll_class_name_element_to_page_percent(people_list_class_name, page_percent)
+            #self.focus()
+            self._wait_for_people_cards()
+
+        # with snapshots on, the cards are parsed from the same page source that was saved
+        page_source = self.record_page(url)
+        if page_source is not None:
+            with self.phase("people_cards"):
+                people_profiles = parsers.parse_people_cards(page_source)
+            if people_profiles:
+                if self.DEBUG_SAMPLE_RATE > 0:
+                    self._dump_sampled_cards(self._people_cards() or [])
+                return people_profiles
+
+        people_cards = self._people_cards()
+        if people_cards is None:
+            return []
+        with self.phase("people_cards"):
+            people_profiles = self.scrape_people_cards(people_cards)
+        # after extraction, whichever way the cards were read
+        self._dump_sampled_cards(people_cards)
         return people_profiles
@@ -1,18 +1,36 @@
 import requests
-from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import NoSuchElementException
+from .driver_factory import create_driver
 from .objects import Experience, Education, Scraper, Interest, Accomplishment, Contact
+from . import parsers
+from . import scripts
+from . import waits
+from .tabs import TabPool
 import os
+import threading
 from linkedin_scraper import selectors
 
+# connections belong to the logged-in account, so they are scraped once per driver session
+_session_connections = {}
+_session_connections_lock = threading.Lock()
+
 
 class Person(Scraper):
 
     __TOP_CARD = "main"
     __WAIT_FOR_ELEMENT_TIMEOUT = 5
+    CONNECTIONS_URL = "https://www.linkedin.com/mynetwork/invite-connect/connections/"
+    SECTIONS = ("top_card", "about", "experiences", "educations", "interests", "accomplishments", "connections")
+    # sections read from the profile page itself, as opposed to a details page
+    PROFILE_SECTIONS = ("top_card", "about", "interests", "accomplishments")
+    # details page and lxml parser of the sections that have one
+    DETAILS_PAGES = {
+        "experiences": ("details/experience", parsers.parse_experiences),
+        "educations": ("details/education", parsers.parse_educations),
+    }
 
     def __init__(
         self,
@@ -31,8 +49,21 @@ class Person(Scraper):
         scrape=True,
         close_on_complete=True,
         time_to_wait_after_login=0,
+        parse_mode="lxml",
+        scrape_connections=True,
+        sections=None,
+        last_fingerprint=None,
+        tabs=False,
     ):
         self.linkedin_url = linkedin_url
+        self.parse_mode = parse_mode
+        self.scrape_connections = scrape_connections
+        self.sections = self._resolve_sections(sections, scrape_connections)
+        self._left_profile = False
+        self.last_fingerprint = last_fingerprint
+        self.tabs = tabs
+        self.fingerprint = None
+        self.unchanged = False
         self.name = name
         self.about = about or []
         self.experiences = experiences or []
@@ -43,26 +74,39 @@ class Person(Scraper):
         self.contacts = contacts or []
 
         if driver is None:
-            try:
-                if os.getenv("CHROMEDRIVER") == None:
-                    driver_path = os.path.join(
-                        os.path.dirname(__file__), "drivers/chromedriver"
-                    )
-                else:
-                    driver_path = os.getenv("CHROMEDRIVER")
-
-                driver = webdriver.Chrome(driver_path)
-            except:
-                driver = webdriver.Chrome()
+            driver = create_driver()
 
         if get:
-            driver.get(linkedin_url)
+            self.load_page(linkedin_url, driver=driver)
 
         self.driver = driver
 
         if scrape:
             self.scrape(close_on_complete)
 
+    @classmethod
+    def _resolve_sections(cls, sections, scrape_connections=True):
+        if sections is None:
+            sections = cls.SECTIONS
+        if isinstance(sections, str):
+            sections = [sections]
+        unknown = set(sections) - set(cls.SECTIONS)
+        if unknown:
+            raise ValueError(f"Unknown sections {sorted(unknown)}, expected some of {list(cls.SECTIONS)}")
+        sections = frozenset(sections)
+        if not scrape_connections:
+            sections -= {"connections"}
+        return sections
+
+    def wants(self, *sections):
+        """Return True if any of `sections` is to be scraped."""
+        return any(section in self.sections for section in sections)
+
+    @property
+    def partial(self):
+        """True if sections other than connections were left out of the scrape."""
+        return not set(self.SECTIONS) - {"connections"} <= self.sections
+
     def add_about(self, about):
         self.about.append(about)
 
@@ -106,14 +150,45 @@ class Person(Scraper):
         except:
             return False
 
-    def get_experiences(self):
-        url = os.path.join(self.linkedin_url, "details/experience")
-        self.driver.get(url)
+    def _open_details_page(self, section):
+        url = os.path.join(self.linkedin_url, section)
+        self.load_page(url)
+        self._left_profile = True
         self.focus()
         main = self.wait_for_element_to_load(by=By.TAG_NAME, name="main")
         self.scroll_to_half()
         self.scroll_to_bottom()
         main_list = self.wait_for_element_to_load(name="pvs-list__container", base=main)
+        if self.parse_mode != "lxml":
+            # the lxml path saves the page source it parses, see _parse_page_source
+            self.record_page(url)
+        return main_list
+
+    def _parse_page_source(self, parser, url=None):
+        """Parse the current page with one `page_source` fetch instead of per-element calls.
+
+        The same page source is saved as the snapshot of `url`. Returns None when
+        the lxml parse fails so the caller can fall back to Selenium.
+        """
+        try:
+            page_source = self.driver.page_source
+            self.record_page(url or self.driver.current_url, page_source)
+            return parser(page_source)
+        except Exception as e:
+            print(f"lxml parse failed, falling back to selenium: {e}")
+            return None
+
+    def get_experiences(self):
+        main_list = self._open_details_page("details/experience")
+        if self.parse_mode == "lxml":
+            experiences = self._parse_page_source(parsers.parse_experiences, os.path.join(self.linkedin_url, "details/experience"))
+            if experiences is not None:
+                for experience in experiences:
+                    self.add_experience(experience)
+                return
+        self._get_experiences_from_elements(main_list)
+
+    def _get_experiences_from_elements(self, main_list):
         for position in main_list.find_elements(By.CLASS_NAME, "pvs-list__paged-list-item"):
             position = position.find_element(By.CSS_SELECTOR, "div[data-view-name='profile-component-entity']")
             company_logo_elem, position_details = position.find_elements(By.XPATH, "*")
@@ -186,7 +261,7 @@ class Person(Scraper):
                         to_date=to_date,
                         duration=duration,
                         location=location,
-                        description=description,
+                        description=description.text,
                         institution_name=company,
                         linkedin_url=company_linkedin_url
                     )
@@ -206,14 +281,49 @@ class Person(Scraper):
                 )
                 self.add_experience(experience)
 
+    def get_details_in_tabs(self):
+        """Load the wanted details pages in parallel tabs and parse each one as it finishes.
+
+        The profile stays loaded in the driver's own tab, so it needs no reload
+        afterwards. A section whose tab fails is scraped the usual way.
+        """
+        pages = {
+            os.path.join(self.linkedin_url, path): (section, parser)
+            for section, (path, parser) in self.DETAILS_PAGES.items()
+            if self.wants(section)
+        }
+        failed = []
+        with TabPool(self.driver, size=len(pages)) as tabs:
+            for result in tabs.map(pages, ready="main .pvs-list__container", scroll=True):
+                section, parser = pages[result.url]
+                records = None
+                if result.ok:
+                    self.record_page(result.url, result.value)
+                    try:
+                        records = parser(result.value)
+                    except Exception as e:
+                        print(f"lxml parse failed, falling back to selenium: {e}")
+                else:
+                    print(f"loading {result.url} in a tab failed, falling back to the driver's tab: {result.error!r}")
+                if records is None:
+                    failed.append(section)
+                    continue
+                for record in records:
+                    getattr(self, "add_" + section[:-1])(record)
+        for section in failed:
+            getattr(self, "get_" + section)()
+
     def get_educations(self):
-        url = os.path.join(self.linkedin_url, "details/education")
-        self.driver.get(url)
-        self.focus()
-        main = self.wait_for_element_to_load(by=By.TAG_NAME, name="main")
-        self.scroll_to_half()
-        self.scroll_to_bottom()
-        main_list = self.wait_for_element_to_load(name="pvs-list__container", base=main)
+        main_list = self._open_details_page("details/education")
+        if self.parse_mode == "lxml":
+            educations = self._parse_page_source(parsers.parse_educations, os.path.join(self.linkedin_url, "details/education"))
+            if educations is not None:
+                for education in educations:
+                    self.add_education(education)
+                return
+        self._get_educations_from_elements(main_list)
+
+    def _get_educations_from_elements(self, main_list):
         for position in main_list.find_elements(By.CLASS_NAME,"pvs-list__paged-list-item"):
             position = position.find_element(By.XPATH,"//div[@data-view-name='profile-component-entity']")
             institution_logo_elem, position_details = position.find_elements(By.XPATH,"*")
@@ -257,6 +367,12 @@ class Person(Scraper):
             )
             self.add_education(education)
 
+    def _wait_for_profile_ready(self):
+        self.settle(5, EC.all_of(
+            waits.document_ready,
+            EC.presence_of_element_located((By.XPATH, "//*[@class='mt2 relative']")),
+        ))
+
     def get_name_and_location(self):
         top_panel = self.driver.find_element(By.XPATH, "//*[@class='mt2 relative']")
         self.name = top_panel.find_element(By.TAG_NAME, "h1").text
@@ -269,46 +385,9 @@ class Person(Scraper):
             about=None
         self.about = about
 
-    def scrape_logged_in(self, close_on_complete=True):
+    def get_interests(self):
         driver = self.driver
-        duration = None
-
-        root = WebDriverWait(driver, self.__WAIT_FOR_ELEMENT_TIMEOUT).until(
-            EC.presence_of_element_located(
-                (
-                    By.TAG_NAME,
-                    self.__TOP_CARD,
-                )
-            )
-        )
-        self.focus()
-        self.wait(5)
-
-        # get name and location
-        self.get_name_and_location()
-
-        self.open_to_work = self.is_open_to_work()
-
-        # get about
-        self.get_about()
-        driver.execute_script(
-            "window.scrollTo(0, Math.ceil(document.body.scrollHeight/2));"
-        )
-        driver.execute_script(
-            "window.scrollTo(0, Math.ceil(document.body.scrollHeight/1.5));"
-        )
-
-        # get experience
-        self.get_experiences()
-
-        # get education
-        self.get_educations()
-
-        driver.get(self.linkedin_url)
-
-        # get interest
         try:
-
             _ = WebDriverWait(driver, self.__WAIT_FOR_ELEMENT_TIMEOUT).until(
                 EC.presence_of_element_located(
                     (
@@ -324,13 +403,14 @@ class Person(Scraper):
                 "//*[@class='pv-interest-entity pv-profile-section__card-item ember-view']"
             ):
                 interest = Interest(
-                    interestElement.find_element(By.TAG_NAME, "h3").text.strip()
+                    title=interestElement.find_element(By.TAG_NAME, "h3").text.strip()
                 )
                 self.add_interest(interest)
         except:
             pass
 
-        # get accomplishment
+    def get_accomplishments(self):
+        driver = self.driver
         try:
             _ = WebDriverWait(driver, self.__WAIT_FOR_ELEMENT_TIMEOUT).until(
                 EC.presence_of_element_located(
@@ -350,32 +430,133 @@ class Person(Scraper):
                 for title in block.find_element(By.TAG_NAME,
                     "ul"
                 ).find_elements(By.TAG_NAME, "li"):
-                    accomplishment = Accomplishment(category.text, title.text)
+                    accomplishment = Accomplishment(category=category.text, title=title.text)
                     self.add_accomplishment(accomplishment)
         except:
             pass
 
+    def scrape_logged_in(self, close_on_complete=True):
+        driver = self.driver
+        duration = None
+
+        if self.wants(*self.PROFILE_SECTIONS) or self.last_fingerprint is not None:
+            with self.phase("top_card"):
+                root = WebDriverWait(driver, self.__WAIT_FOR_ELEMENT_TIMEOUT).until(
+                    EC.presence_of_element_located(
+                        (
+                            By.TAG_NAME,
+                            self.__TOP_CARD,
+                        )
+                    )
+                )
+                self.focus()
+                self._wait_for_profile_ready()
+                self.record_page(self.linkedin_url)
+
+            # an unchanged profile page means unchanged details pages, skip them
+            with self.phase("fingerprint"):
+                self.fingerprint = self.page_fingerprint(scripts.PROFILE_FINGERPRINT)
+                self.unchanged = self.fingerprint is not None and self.fingerprint == self.last_fingerprint
+
+        # get name and location
+        if self.wants("top_card"):
+            with self.phase("name_and_location"):
+                self.get_name_and_location()
+
+                self.open_to_work = self.is_open_to_work()
+
+        # get about
+        if self.wants("about"):
+            with self.phase("about"):
+                self.get_about()
+                driver.execute_script(
+                    "window.scrollTo(0, Math.ceil(document.body.scrollHeight/2));"
+                )
+                driver.execute_script(
+                    "window.scrollTo(0, Math.ceil(document.body.scrollHeight/1.5));"
+                )
+
+        # details pages in parallel tabs, leaving the profile loaded
+        in_tabs = self.tabs and self.parse_mode == "lxml" and not self.unchanged
+        if in_tabs and self.wants(*self.DETAILS_PAGES):
+            with self.phase("details_tabs"):
+                self.get_details_in_tabs()
+
+        # get experience
+        if self.wants("experiences") and not self.unchanged and not in_tabs:
+            with self.phase("experiences"):
+                self.get_experiences()
+
+        # get education
+        if self.wants("educations") and not self.unchanged and not in_tabs:
+            with self.phase("educations"):
+                self.get_educations()
+
+        # interests and accomplishments are on the profile page, reload it only if a details page replaced it
+        if self.wants("interests", "accomplishments") and self._left_profile:
+            with self.phase("profile_reload"):
+                self.load_page(self.linkedin_url)
+                self._left_profile = False
+
+        # get interest
+        if self.wants("interests"):
+            with self.phase("interests"):
+                self.get_interests()
+
+        # get accomplishment
+        if self.wants("accomplishments"):
+            with self.phase("accomplishments"):
+                self.get_accomplishments()
+
         # get connections
+        if self.wants("connections"):
+            with self.phase("connections"):
+                self.get_connections()
+
+        if close_on_complete:
+            self.clear_connections_cache(driver)
+            driver.quit()
+
+    def get_connections(self):
+        """Add the logged-in account's connections, loading the connections page at most once per session."""
+        session_id = getattr(self.driver, "session_id", None)
+        with _session_connections_lock:
+            contacts = _session_connections.get(session_id)
+        if contacts is None:
+            contacts = self._scrape_connections()
+            if contacts is not None:
+                with _session_connections_lock:
+                    _session_connections[session_id] = contacts
+        for contact in contacts or []:
+            self.add_contact(contact)
+
+    def _scrape_connections(self):
+        driver = self.driver
         try:
-            driver.get("https://www.linkedin.com/mynetwork/invite-connect/connections/")
+            self.load_page(self.CONNECTIONS_URL)
             _ = WebDriverWait(driver, self.__WAIT_FOR_ELEMENT_TIMEOUT).until(
                 EC.presence_of_element_located((By.CLASS_NAME, "mn-connections"))
             )
+            contacts = []
             connections = driver.find_element(By.CLASS_NAME, "mn-connections")
-            if connections is not None:
-                for conn in connections.find_elements(By.CLASS_NAME, "mn-connection-card"):
-                    anchor = conn.find_element(By.CLASS_NAME, "mn-connection-card__link")
-                    url = anchor.get_attribute("href")
-                    name = conn.find_element(By.CLASS_NAME, "mn-connection-card__details").find_element(By.CLASS_NAME, "mn-connection-card__name").text.strip()
-                    occupation = conn.find_element(By.CLASS_NAME, "mn-connection-card__details").find_element(By.CLASS_NAME, "mn-connection-card__occupation").text.strip()
-
-                    contact = Contact(name=name, occupation=occupation, url=url)
-                    self.add_contact(contact)
+            for conn in connections.find_elements(By.CLASS_NAME, "mn-connection-card"):
+                anchor = conn.find_element(By.CLASS_NAME, "mn-connection-card__link")
+                url = anchor.get_attribute("href")
+                name = conn.find_element(By.CLASS_NAME, "mn-connection-card__details").find_element(By.CLASS_NAME, "mn-connection-card__name").text.strip()
+                occupation = conn.find_element(By.CLASS_NAME, "mn-connection-card__details").find_element(By.CLASS_NAME, "mn-connection-card__occupation").text.strip()
+                contacts.append(Contact(name=name, occupation=occupation, url=url))
+            return contacts
         except:
-            connections = None
+            return None
 
-        if close_on_complete:
-            driver.quit()
+    @staticmethod
+    def clear_connections_cache(driver=None):
+        """Forget the connections scraped for `driver`'s session, or for every session."""
+        with _session_connections_lock:
+            if driver is None:
+                _session_connections.clear()
+            else:
+                _session_connections.pop(getattr(driver, "session_id", None), None)
 
     @property
     def company(self):
@@ -399,6 +580,51 @@ class Person(Scraper):
         else:
             return None
 
+    def to_dict(self):
+        return {
+            "linkedin_url": self.linkedin_url,
+            "name": self.name,
+            "location": getattr(self, "location", None),
+            "open_to_work": getattr(self, "open_to_work", False),
+            "about": self.about,
+            "experiences": [experience.to_dict() for experience in self.experiences],
+            "educations": [education.to_dict() for education in self.educations],
+            "interests": [interest.to_dict() for interest in self.interests],
+            "accomplishments": [accomplishment.to_dict() for accomplishment in self.accomplishments],
+            "contacts": [contact.to_dict() for contact in self.contacts],
+            "also_viewed_urls": self.also_viewed_urls,
+            "fingerprint": self.fingerprint,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """Rebuild a scraped Person from `to_dict` output without starting a browser.
+
+        `__init__` would start one when no driver is given, so every attribute it sets is set here instead.
+        """
+        person = cls.__new__(cls)
+        person.driver = None
+        person.linkedin_url = data.get("linkedin_url")
+        person.parse_mode = "lxml"
+        person.scrape_connections = True
+        person.sections = cls._resolve_sections(None)
+        person._left_profile = False
+        person.last_fingerprint = None
+        person.tabs = False
+        person.fingerprint = data.get("fingerprint")
+        person.unchanged = False
+        person.name = data.get("name")
+        person.location = data.get("location")
+        person.open_to_work = data.get("open_to_work", False)
+        person.about = data.get("about")
+        person.experiences = [Experience.from_dict(experience) for experience in data.get("experiences", [])]
+        person.educations = [Education.from_dict(education) for education in data.get("educations", [])]
+        person.interests = [Interest.from_dict(interest) for interest in data.get("interests", [])]
+        person.accomplishments = [Accomplishment.from_dict(accomplishment) for accomplishment in data.get("accomplishments", [])]
+        person.contacts = [Contact.from_dict(contact) for contact in data.get("contacts", [])]
+        person.also_viewed_urls = data.get("also_viewed_urls", [])
+        return person
+
     def __repr__(self):
         return "<Person {name}\n\nAbout\n{about}\n\nExperience\n{exp}\n\nEducation\n{edu}\n\nInterest\n{int}\n\nAccomplishments\n{acc}\n\nContacts\n{conn}>".format(
             name=self.name,
@@ -0,0 +1,243 @@
+import getpass
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from dataclasses import dataclass
+
+from selenium.common.exceptions import WebDriverException
+
+from . import actions
+from .driver_factory import create_driver
+from .company import Company, default_http_session
+from .person import Person
+
+
+@dataclass
+class PoolResult:
+    url: str = None
+    value: object = None
+    error: Exception = None
+
+    @property
+    def ok(self):
+        return self.error is None
+
+
+def is_alive(driver):
+    try:
+        driver.execute_script("return 1;")
+        return True
+    except WebDriverException:
+        return False
+
+
+class DriverPool:
+    """A bounded pool of logged-in drivers shared between worker threads.
+
+    Drivers are created lazily, up to `size`, and logged in once when created.
+    With a `SessionStore` they reuse one saved session instead of each logging in.
+    A driver that stops answering is quit and replaced on the next `acquire`.
+    """
+
+    def __init__(self, size=4, driver_factory=None, email=None, password=None, cookie=None, login=True, session=None, rate_limiter=None):
+        self.size = size
+        self.rate_limiter = rate_limiter
+        self.driver_factory = driver_factory or create_driver
+        self.login = login
+        self.cookie = cookie
+        self.session = session
+        # a valid saved session needs no credentials, so don't prompt for them
+        if login and cookie is None and not (email and password) and (session is None or not session.is_valid()):
+            email = input("Email: ")
+            password = getpass.getpass(prompt="Password: ")
+        self.email = email
+        self.password = password
+
+        self._idle = queue.Queue()
+        self._drivers = set()
+        self._creating = 0
+        self._lock = threading.Lock()
+
+    def _new_driver(self):
+        driver = self.driver_factory()
+        if self.rate_limiter is not None:
+            self.rate_limiter.attach(driver)
+        try:
+            if self.login:
+                actions.login(driver, self.email, self.password, cookie=self.cookie, session=self.session)
+        except Exception:
+            driver.quit()
+            raise
+        return driver
+
+    def acquire(self, timeout=None):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            try:
+                return self._idle.get_nowait()
+            except queue.Empty:
+                pass
+
+            with self._lock:
+                create = len(self._drivers) + self._creating < self.size
+                if create:
+                    self._creating += 1
+            if create:
+                try:
+                    driver = self._new_driver()
+                    with self._lock:
+                        self._drivers.add(driver)
+                    return driver
+                finally:
+                    with self._lock:
+                        self._creating -= 1
+
+            # wake up now and then in case a crashed driver freed a slot
+            try:
+                return self._idle.get(timeout=0.5)
+            except queue.Empty:
+                if deadline is not None and time.monotonic() > deadline:
+                    raise
+
+    def release(self, driver):
+        self._idle.put(driver)
+
+    def discard(self, driver):
+        with self._lock:
+            self._drivers.discard(driver)
+        # the connections scraped per session would otherwise outlive the driver
+        Person.clear_connections_cache(driver)
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    def recycle(self, driver):
+        """Return a driver after a failure; crashed drivers are discarded.
+
+        Returns True if the driver was discarded.
+        """
+        if is_alive(driver):
+            self.release(driver)
+            return False
+        self.discard(driver)
+        return True
+
+    @contextmanager
+    def driver(self, timeout=None):
+        driver = self.acquire(timeout=timeout)
+        try:
+            yield driver
+        except Exception:
+            self.recycle(driver)
+            raise
+        self.release(driver)
+
+    def close(self):
+        with self._lock:
+            drivers = list(self._drivers)
+            self._drivers.clear()
+        for driver in drivers:
+            Person.clear_connections_cache(driver)
+            try:
+                driver.quit()
+            except Exception:
+                pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _map_completed(scrape, urls, workers):
+    """Run `scrape(url)` over `urls` in `workers` threads, yielding a `PoolResult` per url as each finishes."""
+    urls = iter(urls)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        pending = {}
+
+        def submit(count):
+            for url in urls:
+                pending[executor.submit(scrape, url)] = url
+                count -= 1
+                if count <= 0:
+                    break
+
+        # keep a small backlog per worker so huge url lists are not all queued up front
+        submit(workers * 2)
+        try:
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    url = pending.pop(future)
+                    try:
+                        yield PoolResult(url=url, value=future.result())
+                    except Exception as e:
+                        yield PoolResult(url=url, error=e)
+                submit(len(done))
+        finally:
+            # the caller stopped early, drop whatever has not started yet
+            for future in pending:
+                future.cancel()
+
+
+def scrape_people(urls, workers=4, pool=None, retries=1, driver_factory=None, email=None, password=None, cookie=None, cache=None, session=None, rate_limiter=None, refresh=False, **person_kwargs):
+    """Scrape many profiles concurrently, yielding a `PoolResult` per url as each finishes.
+
+    Results come back in completion order, not input order. A url whose driver
+    crashed is retried on a fresh driver up to `retries` times; any other error
+    is reported in `PoolResult.error`. With a `ScrapeCache`, cached profiles are
+    returned without touching a driver and new ones are stored. With `refresh`
+    as well, cached profiles are scraped again, skipping their details pages
+    when their fingerprint has not changed (see `ScrapeCache.fetch`). With a
+    `SessionStore`, the drivers share one saved login, and with a `RateLimiter`
+    their page loads are paced together.
+    """
+    owns_pool = pool is None
+    if owns_pool:
+        pool = DriverPool(size=workers, driver_factory=driver_factory, email=email, password=password, cookie=cookie, session=session, rate_limiter=rate_limiter)
+    person_kwargs.setdefault("close_on_complete", False)
+
+    def scrape_with_driver(url, **kwargs):
+        for attempt in range(retries + 1):
+            driver = pool.acquire()
+            try:
+                person = Person(url, driver=driver, **kwargs)
+            except Exception:
+                if pool.recycle(driver) and attempt < retries:
+                    continue
+                raise
+            pool.release(driver)
+            return person
+
+    def scrape(url):
+        if cache is not None:
+            # a hit never takes a driver, so never starts a browser
+            return cache.fetch(
+                "person", url, refresh=refresh,
+                scrape=lambda **kwargs: scrape_with_driver(url, **kwargs), **person_kwargs
+            )
+        return scrape_with_driver(url, **person_kwargs)
+
+    try:
+        yield from _map_completed(scrape, urls, workers)
+    finally:
+        if owns_pool:
+            pool.close()
+
+
+def scrape_public_companies(urls, workers=32, session=None, **company_kwargs):
+    """Fetch many public company pages over HTTP, yielding a `PoolResult` per url as each finishes.
+
+    No browser is involved, so `workers` can be in the hundreds. They share one
+    `requests.Session` and with it its connection pool.
+    """
+    session = session or default_http_session()
+
+    def scrape(url):
+        return Company(url, http=True, session=session, **company_kwargs)
+
+    return _map_completed(scrape, urls, workers)
@@ -0,0 +1,187 @@
+import json
+import os
+import random
+import re
+import threading
+import time
+import urllib.parse
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+# Kinds of page, each with its own rate. The first matching pattern wins.
+URL_CLASSES = [
+    ("profile_details", re.compile(r"^/in/[^/]+/details/")),
+    ("profile", re.compile(r"^/in/")),
+    ("company", re.compile(r"^/company/")),
+    ("job", re.compile(r"^/jobs/view/")),
+    ("search", re.compile(r"^/(search/results|jobs/search)")),
+    ("connections", re.compile(r"^/mynetwork/")),
+]
+
+# page loads per minute, and the burst allowed on top, per account
+DEFAULT_RATES = {
+    "*": (30, 5),
+    "profile": (12, 3),
+    "profile_details": (20, 4),
+    "company": (12, 3),
+    "job": (20, 4),
+    "search": (6, 2),
+    "connections": (2, 1),
+}
+
+
+def classify(url):
+    """Return the name of the `URL_CLASSES` entry matching `url`, or "other"."""
+    path = urllib.parse.urlsplit(url or "").path
+    for name, pattern in URL_CLASSES:
+        if pattern.match(path):
+            return name
+    return "other"
+
+
+class TokenBucket(object):
+    """A token bucket shared between the threads of one process.
+
+    Holds up to `burst` tokens and refills at `rate` tokens per second.
+    """
+
+    def __init__(self, rate, burst=1):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, tokens=1):
+        """Take `tokens` now and return how many seconds to wait before using them."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= tokens
+            return max(0.0, -self._tokens / self.rate)
+
+    def acquire(self, tokens=1):
+        """Block until `tokens` are available, returning the seconds waited."""
+        delay = self.reserve(tokens)
+        if delay:
+            time.sleep(delay)
+        return delay
+
+
+class FileTokenBucket(object):
+    """A token bucket shared between processes through a small state file.
+
+    Every process using the same `path` draws from the same bucket. Updates are
+    serialized with an exclusive file lock, and waiting happens outside it.
+    """
+
+    def __init__(self, path, rate, burst=1):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.rate = rate
+        self.burst = burst
+
+    def _lock(self, f):
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        else:
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+
+    def _unlock(self, f):
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+        else:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+    def reserve(self, tokens=1):
+        with open(self.path, "a+") as f:
+            self._lock(f)
+            try:
+                f.seek(0)
+                try:
+                    state = json.loads(f.read())
+                    available, updated = state["tokens"], state["updated"]
+                except (ValueError, KeyError):
+                    available, updated = self.burst, time.time()
+                # wall clock time, the only clock processes share
+                now = time.time()
+                available = min(self.burst, available + max(0.0, now - updated) * self.rate) - tokens
+                f.seek(0)
+                f.truncate()
+                f.write(json.dumps({"tokens": available, "updated": now}))
+                f.flush()
+            finally:
+                self._unlock(f)
+        return max(0.0, -available / self.rate)
+
+    def acquire(self, tokens=1):
+        delay = self.reserve(tokens)
+        if delay:
+            time.sleep(delay)
+        return delay
+
+
+class RateLimiter(object):
+    """Paces page loads per account and per kind of page, with random jitter.
+
+    `rates` maps a url class from `URL_CLASSES` (or "other") to page loads per
+    minute, optionally as a `(per_minute, burst)` tuple. The "*" entry limits
+    all page loads of the account together. Classes without an entry are only
+    held to "*".
+
+    Limiters with the same `account` share their buckets within a process. With
+    `directory`, the buckets are files in it and are shared by every process
+    that uses the same directory and account.
+    """
+
+    _shared = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(self, rates=None, account="default", jitter=0.5, directory=None):
+        self.rates = dict(DEFAULT_RATES if rates is None else rates)
+        self.account = account
+        self.jitter = jitter
+        self.directory = directory
+        self.waited = 0.0
+
+    def _bucket(self, url_class):
+        rate = self.rates.get(url_class)
+        if rate is None:
+            return None
+        per_minute, burst = rate if isinstance(rate, tuple) else (rate, 1)
+        key = (self.directory, self.account, url_class, per_minute, burst)
+        with self._shared_lock:
+            bucket = self._shared.get(key)
+            if bucket is None:
+                if self.directory is None:
+                    bucket = TokenBucket(per_minute / 60, burst)
+                else:
+                    name = re.sub(r"[^\w.-]", "_", f"{self.account}-{url_class}") + ".bucket"
+                    bucket = FileTokenBucket(os.path.join(self.directory, name), per_minute / 60, burst)
+                self._shared[key] = bucket
+        return bucket
+
+    def wait(self, url):
+        """Block until a page load of `url` is allowed, returning the seconds waited."""
+        delay = 0.0
+        for url_class in ("*", classify(url)):
+            bucket = self._bucket(url_class)
+            if bucket is not None:
+                delay = max(delay, bucket.reserve())
+        if self.jitter:
+            delay += random.uniform(0, self.jitter)
+        if delay:
+            time.sleep(delay)
+        self.waited += delay
+        return delay
+
+    def attach(self, driver):
+        """Make every scraper using `driver` go through this limiter, e.g. one limiter per account."""
+        driver.rate_limiter = self
+        return driver
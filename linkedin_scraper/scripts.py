@@ -0,0 +1,105 @@
+# JavaScript run through `driver.execute_script` to read a whole list of cards in
+# one WebDriver call. Each script returns an array of plain records, with null for
+# a card that the per-element Selenium parser would have skipped.
+
+EMPLOYEE_CARDS = """
+const [list, offset] = arguments;
+return Array.from(list.getElementsByTagName("li")).slice(offset).map(card => {
+    const lines = card.innerText.split("\\n");
+    const link = card.querySelector("a");
+    if (lines.length < 4 || !link) {
+        return null;
+    }
+    return {name: lines[0].trim(), designation: lines[3].trim(), linkedin_url: link.href};
+});
+"""
+
+JOB_CARDS = """
+const text = (card, selector) => {
+    const elem = card.querySelector(selector);
+    return elem ? elem.innerText : null;
+};
+return Array.from(arguments[0]).map(card => {
+    const link = card.querySelector(".job-card-list__title--link");
+    const company = text(card, ".artdeco-entity-lockup__subtitle");
+    const location = text(card, ".job-card-container__metadata-wrapper");
+    if (!link || company === null || location === null) {
+        return null;
+    }
+    return {title: link.innerText.trim(), linkedin_url: link.href, company: company, location: location};
+});
+"""
+
+# Text a content fingerprint is hashed from, see `Scraper.page_fingerprint`: the
+# top card and, per profile section, its id, item count and text.
+PROFILE_FINGERPRINT = """
+const main = document.querySelector("main");
+if (!main) {
+    return null;
+}
+const top = main.querySelector(".mt2.relative");
+const parts = [top ? top.innerText : ""];
+for (const anchor of main.querySelectorAll(".pv-profile-card__anchor[id]")) {
+    const section = anchor.closest("section");
+    if (section) {
+        parts.push(anchor.id + ":" + section.querySelectorAll("li").length + ":" + section.innerText);
+    }
+}
+return parts.join("\n");
+"""
+
+COMPANY_FINGERPRINT = """
+const top = document.querySelector(".org-top-card");
+return top ? top.innerText : null;
+"""
+
+PEOPLE_CARDS = """
+return Array.from(arguments[0]).map(card => {
+    const link = card.querySelector(".mb1 a");
+    if (!link || !link.href) {
+        return null;
+    }
+    return {name: link.innerText.trim(), linkedin_url: link.href.split("?")[0]};
+});
+"""
+
+# Used by `linkedin_scraper.tabs.TabPool`. Navigating marks the old document as stale,
+# so a tab is not taken for ready before the new page has replaced it.
+TAB_NAVIGATE = """
+window.__linkedinScraperStale = true;
+window.location.assign(arguments[0]);
+"""
+
+TAB_READY = """
+const [selectors, scroll] = arguments;
+if (window.__linkedinScraperStale || document.readyState === "loading") {
+    return false;
+}
+if (scroll) {
+    window.scrollTo(0, document.body.scrollHeight);
+}
+return selectors.every(selector => document.querySelector(selector) !== null);
+"""
+
+# Used by `linkedin_scraper.selectors.any_of_located`. Returns `[index, elements]` for the
+# first candidate, in order, that matches anything, or null if none does yet.
+FIRST_MATCH = """
+const [candidates, base] = arguments;
+const root = base || document;
+for (let i = 0; i < candidates.length; i++) {
+    const [kind, value] = candidates[i];
+    let found = [];
+    if (kind === "xpath") {
+        const snapshot = document.evaluate(value, root, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+        for (let j = 0; j < snapshot.snapshotLength; j++) {
+            found.push(snapshot.snapshotItem(j));
+        }
+    } else {
+        found = Array.from(root.querySelectorAll(value));
+    }
+    if (found.length) {
+        return [i, found];
+    }
+}
+return null;
+"""
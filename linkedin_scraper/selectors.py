@@ -1 +1,176 @@
+import json
+import os
+import threading
+
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.wait import WebDriverWait
+
+from . import scripts
+
 NAME = 'text-heading-xlarge'
+
+JOB_LISTING_CLASS_NAMES = [
+    "jobs-search__job-details",
+    "scaffold-layout__detail",
+    "jobs-search-results-list",
+    "jobs-search-two-pane__details"
+]
+JOB_CARD_CLASS_NAMES = [
+    "job-card-list",
+    "jobs-search-results__list-item",
+    "job-card-container",
+    "jobs-search-result-item"
+]
+
+# Ordered fallback locators for each logical field. LinkedIn renames classes
+# between layouts, and the first locator that matches wins.
+FIELDS = {
+    "person.name": [(By.CLASS_NAME, NAME)],
+    "job_search.listing": [(By.CLASS_NAME, class_name) for class_name in JOB_LISTING_CLASS_NAMES] + [
+        (By.XPATH, "//div[contains(@class, 'jobs-search__job-details') or contains(@class, 'jobs-details')]"),
+    ],
+    "job_search.cards": [(By.CLASS_NAME, class_name) for class_name in JOB_CARD_CLASS_NAMES] + [
+        (By.XPATH, "//li[contains(@class, 'jobs-search-results__list-item')]"),
+    ],
+}
+
+# where `linkedin-scraper crawl` keeps the learned order, library users pass their own path
+DEFAULT_PATH = os.path.join(os.path.expanduser("~"), ".linkedin_scraper", "selectors.json")
+
+
+def _script_candidate(locator):
+    """`locator` as a `[kind, value]` pair for `scripts.FIRST_MATCH`, or None if it has no CSS or XPath form."""
+    by, value = locator
+    if by == By.XPATH:
+        return ["xpath", value]
+    if by == By.CSS_SELECTOR:
+        return ["css", value]
+    if by == By.CLASS_NAME:
+        return ["css", "." + value]
+    if by == By.TAG_NAME:
+        return ["css", value]
+    if by == By.ID:
+        return ["css", f'[id="{value}"]']
+    if by == By.NAME:
+        return ["css", f'[name="{value}"]']
+    return None
+
+
+class any_of_located(object):
+    """Any of `locators` matches, checked in order on every poll.
+
+    Returns `(index, elements)` for the first locator that matches. Every poll is
+    one `execute_script` call when all the locators have a CSS or XPath form.
+    """
+
+    def __init__(self, locators, base=None):
+        self.locators = list(locators)
+        self.base = base
+        candidates = [_script_candidate(locator) for locator in self.locators]
+        self.candidates = None if None in candidates else candidates
+
+    def __call__(self, driver):
+        if self.candidates is not None and hasattr(driver, "execute_script"):
+            try:
+                match = driver.execute_script(scripts.FIRST_MATCH, self.candidates, self.base)
+                return (match[0], match[1]) if match else False
+            except WebDriverException:
+                # e.g. an XPath that the browser rejects, check one locator at a time
+                pass
+        for index, locator in enumerate(self.locators):
+            elements = (self.base or driver).find_elements(*locator)
+            if elements:
+                return index, elements
+        return False
+
+
+class SelectorRegistry(object):
+    """The fallback locators of every logical field, trying the one that worked last time first.
+
+    `fields` maps a field name to its ordered locators (default `FIELDS`). When
+    a fallback matches, it moves to the front for that field. The order is only
+    kept in memory unless `path` is given, then it is saved there as JSON and
+    loaded by the next run, so a layout change is only paid for once.
+    """
+
+    def __init__(self, fields=None, path=None):
+        self.fields = {name: list(locators) for name, locators in (FIELDS if fields is None else fields).items()}
+        self.path = path
+        self._preferred = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        preferred = {}
+        if self.path is not None:
+            try:
+                with open(self.path, encoding="utf-8") as f:
+                    preferred = {name: tuple(locator) for name, locator in json.load(f).items()}
+            except (OSError, ValueError, TypeError):
+                pass
+        return preferred
+
+    def save(self):
+        """Write the learned order to `path`. Returns False if it could not be written.
+
+        Losing the order only costs a slower lookup next run, so a failed write never stops a scrape.
+        """
+        if self.path is None:
+            return False
+        tmp_path = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with self._lock:
+            try:
+                os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(self._preferred or {}, f, indent=2)
+                os.replace(tmp_path, self.path)
+            except OSError as e:
+                print(f"Could not save the selector order to {self.path}: {e}")
+                return False
+        return True
+
+    def candidates(self, field):
+        """The locators of `field`, the last one that matched first."""
+        locators = self.fields[field]
+        with self._lock:
+            if self._preferred is None:
+                self._preferred = self._load()
+            preferred = self._preferred.get(field)
+        # a saved locator that is no longer a fallback of the field is ignored
+        if preferred in locators:
+            return [preferred] + [locator for locator in locators if locator != preferred]
+        return list(locators)
+
+    def succeeded(self, field, locator):
+        """Record that `locator` matched `field`, saving the order if it changed."""
+        locator = tuple(locator)
+        with self._lock:
+            if self._preferred is None:
+                self._preferred = self._load()
+            if self._preferred.get(field) == locator:
+                return
+            self._preferred[field] = locator
+        self.save()
+
+    def find_all(self, driver, field, base=None, timeout=5, log=False):
+        """Wait up to `timeout` for any fallback of `field` and return the elements it matches, or [].
+
+        All the fallbacks are checked on every poll of one wait, instead of
+        waiting out each one in turn.
+        """
+        candidates = self.candidates(field)
+        try:
+            index, elements = WebDriverWait(driver, timeout).until(any_of_located(candidates, base))
+        except TimeoutException:
+            if log:
+                print(f"Timeout waiting for {field}")
+            return []
+        if log:
+            print(f"Found {field} with selector: {candidates[index][1]}")
+        self.succeeded(field, candidates[index])
+        return elements
+
+    def find(self, driver, field, base=None, timeout=5, log=False):
+        """Like `find_all`, returning the first element or None."""
+        elements = self.find_all(driver, field, base=base, timeout=timeout, log=log)
+        return elements[0] if elements else None
@@ -0,0 +1,43 @@
+import json
+
+from .objects import Contact, Institution, Experience, Education, Interest, Accomplishment
+from .person import Person
+from .company import Company
+from .jobs import Job
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+# every type that round-trips through `to_dict`/`from_dict`, by the name stored with it
+TYPES = {
+    cls.__name__: cls
+    for cls in (Person, Company, Job, Contact, Institution, Experience, Education, Interest, Accomplishment)
+}
+
+
+def to_dict(obj):
+    """A plain dict tagged with the type of `obj`, for `from_dict`."""
+    return {"type": type(obj).__name__, "data": obj.to_dict()}
+
+
+def from_dict(data):
+    return TYPES[data["type"]].from_dict(data["data"])
+
+
+def dumps(obj, format="msgpack"):
+    """Serialize a scraped object to bytes, with msgpack (needs `pip install msgpack`) or JSON."""
+    if format == "json":
+        return json.dumps(to_dict(obj), separators=(",", ":")).encode("utf-8")
+    if msgpack is None:
+        raise ImportError("msgpack is not installed, install it with `pip install msgpack` or use format='json'")
+    return msgpack.packb(to_dict(obj), use_bin_type=True)
+
+
+def loads(payload, format="msgpack"):
+    if format == "json":
+        return from_dict(json.loads(payload))
+    if msgpack is None:
+        raise ImportError("msgpack is not installed, install it with `pip install msgpack` or use format='json'")
+    return from_dict(msgpack.unpackb(payload, raw=False))
@@ -0,0 +1,228 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+import requests
+
+from . import actions
+from .urls import LINKEDIN_HOST, is_linkedin_host
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+# the cookie fields `Network.setCookies` accepts
+_COOKIE_FIELDS = ("name", "value", "domain", "path", "secure", "httpOnly", "sameSite", "expires")
+
+_LOCAL_STORAGE_SCRIPT = """
+const items = %s;
+if (location.hostname === "%s") {
+    for (const [key, value] of Object.entries(items)) {
+        if (window.localStorage.getItem(key) === null) {
+            window.localStorage.setItem(key, value);
+        }
+    }
+}
+"""
+
+
+class SessionStore(object):
+    """Saves a logged-in LinkedIn session to a file and restores it into new drivers.
+
+    After one form login the whole cookie jar and the site's localStorage are
+    saved. Later drivers get them injected without loading `/login`. The saved
+    session is checked with one request to the API before it is reused, and a
+    file lock makes sure only one process logs in again when it has expired.
+    """
+
+    BASE_URL = f"https://{LINKEDIN_HOST}"
+    CHECK_URL = f"https://{LINKEDIN_HOST}/voyager/api/me"
+    # a session that passed the check is trusted for this many seconds without another request
+    CHECK_INTERVAL = 5 * 60
+    LOCK_TIMEOUT = 120
+
+    def __init__(self, path=None):
+        if path is None:
+            path = os.path.join(os.path.expanduser("~"), ".linkedin_scraper", "session.json")
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.lock_path = path + ".lock"
+        self._checked = {}
+        self._lock = threading.Lock()
+
+    def load(self):
+        """Return the saved session, or None if there is none."""
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def save(self, driver):
+        """Save the cookies and localStorage of a logged-in `driver`."""
+        session = {
+            "cookies": self._get_cookies(driver),
+            "local_storage": self._get_local_storage(driver),
+            "saved_at": time.time(),
+        }
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        # the cookies are as good as a password, keep them private to the user
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(session, f)
+        os.replace(tmp_path, self.path)
+        with self._lock:
+            self._checked[session["saved_at"]] = time.monotonic()
+        return session
+
+    def clear(self):
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+    @staticmethod
+    def _get_cookies(driver):
+        if hasattr(driver, "execute_cdp_cmd"):
+            # unlike get_cookies, this includes the cookies of every linkedin.com subdomain
+            cookies = driver.execute_cdp_cmd("Network.getAllCookies", {})["cookies"]
+        else:
+            cookies = driver.get_cookies()
+            for cookie in cookies:
+                if "expiry" in cookie:
+                    cookie["expires"] = cookie.pop("expiry")
+        return [
+            {key: cookie[key] for key in _COOKIE_FIELDS if key in cookie}
+            for cookie in cookies if is_linkedin_host(cookie.get("domain", "").lstrip("."))
+        ]
+
+    @staticmethod
+    def _get_local_storage(driver):
+        try:
+            return driver.execute_script(
+                "return location.hostname === arguments[0] ? Object.assign({}, window.localStorage) : {};",
+                LINKEDIN_HOST
+            ) or {}
+        except Exception:
+            return {}
+
+    def is_valid(self, session=None):
+        """Check with one API request whether the saved session is still logged in."""
+        session = session or self.load()
+        if not session or not session.get("cookies"):
+            return False
+        with self._lock:
+            checked_at = self._checked.get(session["saved_at"])
+        if checked_at is not None and time.monotonic() - checked_at < self.CHECK_INTERVAL:
+            return True
+
+        cookies = {cookie["name"]: cookie["value"] for cookie in session["cookies"]}
+        try:
+            response = requests.get(
+                self.CHECK_URL,
+                cookies=cookies,
+                headers={
+                    "csrf-token": cookies.get("JSESSIONID", "").strip('"'),
+                    "accept": "application/vnd.linkedin.normalized+json+2.1",
+                },
+                allow_redirects=False,
+                timeout=10,
+            )
+        except requests.RequestException:
+            return False
+        if response.status_code != 200:
+            return False
+        with self._lock:
+            self._checked[session["saved_at"]] = time.monotonic()
+        return True
+
+    def inject(self, driver, session=None):
+        """Put the saved cookies and localStorage into `driver` without loading `/login`.
+
+        Returns False if there is no saved session.
+        """
+        session = session or self.load()
+        if not session:
+            return False
+        cookies = session["cookies"]
+        local_storage = session.get("local_storage") or {}
+        if hasattr(driver, "execute_cdp_cmd"):
+            # session cookies are saved with expires -1, which would set them already expired
+            cookies = [
+                {key: value for key, value in cookie.items() if key != "expires" or (value and value > 0)}
+                for cookie in cookies
+            ]
+            driver.execute_cdp_cmd("Network.setCookies", {"cookies": cookies})
+            if local_storage:
+                driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {
+                    "source": _LOCAL_STORAGE_SCRIPT % (json.dumps(local_storage), LINKEDIN_HOST)
+                })
+            return True
+
+        # cookies can only be added for the domain of the current page
+        driver.get(f"{self.BASE_URL}/robots.txt")
+        for cookie in cookies:
+            cookie = dict(cookie)
+            if "expires" in cookie:
+                expires = cookie.pop("expires")
+                if expires and expires > 0:
+                    cookie["expiry"] = int(expires)
+            driver.add_cookie(cookie)
+        if local_storage:
+            driver.execute_script(
+                "for (const [key, value] of Object.entries(arguments[0])) window.localStorage.setItem(key, value);",
+                local_storage
+            )
+        return True
+
+    @contextmanager
+    def lock(self, timeout=None):
+        """Hold an exclusive lock on the session file, shared by every process using the same path."""
+        timeout = self.LOCK_TIMEOUT if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        with open(self.lock_path, "a+") as f:
+            while True:
+                try:
+                    if fcntl is not None:
+                        fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    else:
+                        msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+                    break
+                except OSError:
+                    if time.monotonic() > deadline:
+                        raise TimeoutError(f"Timed out waiting for the lock on {self.lock_path}")
+                    time.sleep(0.2)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+                else:
+                    f.seek(0)
+                    msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+    def login(self, driver, email=None, password=None, cookie=None, timeout=10):
+        """Log `driver` in, reusing the saved session if it is still valid.
+
+        Otherwise one process logs in through the form (or with `cookie`) and
+        saves the new session, while the others wait on the lock and reuse it.
+        """
+        session = self.load()
+        if session and self.is_valid(session):
+            return self.inject(driver, session)
+
+        with self.lock():
+            # another process may have logged in while this one waited for the lock
+            fresh = self.load()
+            if fresh and (not session or fresh["saved_at"] != session["saved_at"]) and self.is_valid(fresh):
+                return self.inject(driver, fresh)
+            actions.login(driver, email, password, cookie=cookie, timeout=timeout)
+            if cookie is not None:
+                # _login_with_cookie stops on the login page, load a page that sets the remaining cookies
+                driver.get(f"{self.BASE_URL}/feed/")
+            self.save(driver)
+        return True
@@ -0,0 +1,244 @@
+import gzip
+import hashlib
+import multiprocessing
+import os
+import re
+import sqlite3
+import threading
+import time
+import urllib.parse
+from dataclasses import dataclass
+
+from . import parsers
+from .urls import normalize_url
+
+# Kinds of page, by url path. The first matching pattern wins.
+KINDS = [
+    ("experience", re.compile(r"^/in/[^/]+/details/experience")),
+    ("education", re.compile(r"^/in/[^/]+/details/education")),
+    ("profile", re.compile(r"^/in/[^/]+/?$")),
+    ("company_about", re.compile(r"^/company/[^/]+/about")),
+    ("company_people", re.compile(r"^/company/[^/]+/people")),
+    ("company", re.compile(r"^/company/[^/]+/?$")),
+    ("job", re.compile(r"^/jobs/view/")),
+    ("job_search", re.compile(r"^/jobs/search")),
+    ("people_search", re.compile(r"^/search/results/people")),
+]
+
+# the lxml parser `replay` runs on each kind of page
+PARSERS = {
+    "experience": parsers.parse_experiences,
+    "education": parsers.parse_educations,
+    "profile": parsers.parse_profile,
+    "company_about": parsers.parse_company_about,
+    "company_people": parsers.parse_employees,
+    "company_public": parsers.parse_public_company,
+    "job": parsers.parse_job,
+    "job_search": parsers.parse_job_cards,
+    "people_search": parsers.parse_people_cards,
+}
+
+# kinds whose query string picks the page, so it is kept when their url is normalized
+QUERY_KINDS = ("job_search", "people_search")
+
+
+def classify(url):
+    """Return the name of the `KINDS` entry matching `url`, or "other"."""
+    path = urllib.parse.urlsplit(url or "").path
+    for name, pattern in KINDS:
+        if pattern.match(path):
+            return name
+    return "other"
+
+
+def snapshot_url(url, kind=None):
+    """`url` as the snapshot index keys it: normalized like the cache does, except search pages keep their query."""
+    if (kind or classify(url)) in QUERY_KINDS:
+        return url
+    return normalize_url(url)
+
+
+def _blob_path(directory, digest):
+    return os.path.join(directory, "objects", digest[:2], digest + ".html.gz")
+
+
+def _read_blob(path):
+    with open(path, "rb") as f:
+        return gzip.decompress(f.read()).decode("utf-8")
+
+
+@dataclass
+class Snapshot:
+    url: str = None
+    kind: str = None
+    digest: str = None
+    fetched_at: float = None
+
+
+@dataclass
+class ReplayResult:
+    snapshot: Snapshot = None
+    value: object = None
+    error: Exception = None
+
+    @property
+    def ok(self):
+        return self.error is None
+
+
+class SnapshotStore(object):
+    """Saves the HTML of scraped pages, gzip compressed, so they can be parsed again later without a browser.
+
+    Pages are stored once per distinct content under the SHA-256 of their HTML,
+    in `directory/objects/`. A SQLite index records every fetch by url, kind
+    of page and time, so the same unchanged page fetched a hundred times costs
+    one file and a hundred rows. Set `Scraper.SNAPSHOTS` to a store to record
+    every page the scrapers load.
+    """
+
+    def __init__(self, directory=None, compresslevel=6):
+        if directory is None:
+            directory = os.path.join(os.path.expanduser("~"), ".linkedin_scraper", "snapshots")
+        os.makedirs(os.path.join(directory, "objects"), exist_ok=True)
+        self.directory = directory
+        self.index_path = os.path.join(directory, "index.sqlite")
+        self.compresslevel = compresslevel
+        self._lock = threading.Lock()
+        # several crawl processes may write to the same store
+        self.connection = sqlite3.connect(self.index_path, check_same_thread=False, isolation_level=None, timeout=30)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS snapshots ("
+            " url TEXT NOT NULL, kind TEXT NOT NULL, digest TEXT NOT NULL, fetched_at REAL NOT NULL)"
+        )
+        self.connection.execute("CREATE INDEX IF NOT EXISTS snapshots_url ON snapshots (url, fetched_at)")
+        self.connection.execute("CREATE INDEX IF NOT EXISTS snapshots_kind ON snapshots (kind, fetched_at)")
+
+    def blob_path(self, digest):
+        return _blob_path(self.directory, digest)
+
+    def put(self, url, page_source, kind=None, fetched_at=None):
+        """Save `page_source` as a snapshot of `url` and return its digest.
+
+        `kind` defaults to the one `classify` finds for `url`, which is indexed by `snapshot_url`.
+        """
+        kind = kind or classify(url)
+        data = page_source.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        path = self.blob_path(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(gzip.compress(data, compresslevel=self.compresslevel, mtime=0))
+            os.replace(tmp_path, path)
+        with self._lock:
+            self.connection.execute(
+                "INSERT INTO snapshots (url, kind, digest, fetched_at) VALUES (?, ?, ?, ?)",
+                (snapshot_url(url, kind), kind, digest, time.time() if fetched_at is None else fetched_at)
+            )
+        return digest
+
+    def get(self, digest):
+        """The HTML stored under `digest`."""
+        return _read_blob(self.blob_path(digest))
+
+    def latest(self, url, before=None):
+        """The newest `Snapshot` of `url`, fetched before `before` if given, or None."""
+        with self._lock:
+            row = self.connection.execute(
+                "SELECT url, kind, digest, fetched_at FROM snapshots WHERE url = ? AND fetched_at < ?"
+                " ORDER BY fetched_at DESC LIMIT 1",
+                (snapshot_url(url), float("inf") if before is None else before)
+            ).fetchone()
+        return Snapshot(*row) if row else None
+
+    def history(self, url):
+        """Every `Snapshot` of `url`, oldest first."""
+        with self._lock:
+            rows = self.connection.execute(
+                "SELECT url, kind, digest, fetched_at FROM snapshots WHERE url = ? ORDER BY fetched_at", (snapshot_url(url),)
+            ).fetchall()
+        return [Snapshot(*row) for row in rows]
+
+    def snapshots(self, kinds=None, since=None, until=None, latest=True):
+        """Yield the `Snapshot`s of the given `kinds`, fetched between `since` and `until`.
+
+        With `latest`, only the newest snapshot of each url and kind is yielded. Rows are
+        read in batches on a connection of their own, so the index can be
+        walked while pages are still being recorded.
+        """
+        query = "SELECT url, kind, digest, {} FROM snapshots WHERE fetched_at >= ? AND fetched_at < ?"
+        params = [since or 0, float("inf") if until is None else until]
+        if kinds is not None:
+            kinds = [kinds] if isinstance(kinds, str) else list(kinds)
+            query += f" AND kind IN ({', '.join('?' * len(kinds))})"
+            params += kinds
+        if latest:
+            # SQLite takes the other columns from the row holding the MAX
+            query = query.format("MAX(fetched_at)") + " GROUP BY url, kind"
+        else:
+            query = query.format("fetched_at") + " ORDER BY fetched_at"
+        connection = sqlite3.connect(self.index_path, timeout=30)
+        try:
+            cursor = connection.execute(query, params)
+            while True:
+                rows = cursor.fetchmany(1000)
+                if not rows:
+                    break
+                for row in rows:
+                    yield Snapshot(*row)
+        finally:
+            connection.close()
+
+    def close(self):
+        with self._lock:
+            self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _parse_snapshot(job):
+    directory, snapshot, parser = job
+    try:
+        return ReplayResult(snapshot, parser(_read_blob(_blob_path(directory, snapshot.digest))))
+    except Exception as e:
+        return ReplayResult(snapshot, error=e)
+
+
+def replay(store, kinds=None, kind_parsers=None, since=None, until=None, latest=True, workers=None, chunksize=64):
+    """Run the lxml parsers over stored snapshots, with no browser, yielding a `ReplayResult` for each.
+
+    Args:
+        store: A `SnapshotStore`
+        kinds: The kinds of page to parse (default: every kind with a parser)
+        kind_parsers: Parser per kind, on top of `PARSERS`. Each takes the page source.
+        since, until, latest: Which snapshots to parse, see `SnapshotStore.snapshots`
+        workers: Processes to parse in (default: one per CPU), 1 parses in this process
+
+    Results come in the order they finish. Parsers must be picklable, i.e.
+    module level functions, to run in more than one process.
+    """
+    by_kind = dict(PARSERS, **(kind_parsers or {}))
+    if kinds is None:
+        kinds = list(by_kind)
+    kinds = [kinds] if isinstance(kinds, str) else list(kinds)
+    missing = set(kinds) - set(by_kind)
+    if missing:
+        raise ValueError(f"No parser for {sorted(missing)}, pass one in kind_parsers")
+    jobs = (
+        (store.directory, snapshot, by_kind[snapshot.kind])
+        for snapshot in store.snapshots(kinds, since=since, until=until, latest=latest)
+    )
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        for job in jobs:
+            yield _parse_snapshot(job)
+        return
+    with multiprocessing.Pool(workers) as pool:
+        yield from pool.imap_unordered(_parse_snapshot, jobs, chunksize=chunksize)
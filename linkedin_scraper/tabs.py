@@ -0,0 +1,172 @@
+import time
+from dataclasses import dataclass
+
+from selenium.common.exceptions import TimeoutException
+
+from . import parsers
+from . import scripts
+from .driver_factory import block_urls
+from .jobs import Job
+from .objects import Scraper
+
+# Chrome throttles tabs in the background, keep them loading at full speed.
+# Pass to `create_driver(arguments=TAB_ARGUMENTS)` for drivers that run a `TabPool`.
+TAB_ARGUMENTS = (
+    "--disable-background-timer-throttling",
+    "--disable-renderer-backgrounding",
+    "--disable-backgrounding-occluded-windows",
+)
+
+# what a job page has once the fields `parse_job` reads are rendered
+JOB_READY = (".job-details-jobs-unified-top-card__job-title", ".jobs-description")
+
+
+@dataclass
+class TabResult:
+    url: str = None
+    value: object = None
+    error: Exception = None
+
+    @property
+    def ok(self):
+        return self.error is None
+
+
+class TabPool(object):
+    """Loads pages in `size` tabs of one logged-in driver, yielding each page as soon as it is ready.
+
+    Every tab of a browser shares its processes and its login, so K pages in
+    flight cost one Chrome instead of K. Navigation is started in every free tab
+    without waiting, then the tabs are polled and each finished page is parsed
+    while the others keep loading. Tabs are opened on first use and closed by
+    `close`, which leaves the driver on the window it started on.
+    """
+
+    def __init__(self, driver, size=4, timeout=30, poll_frequency=0.2):
+        self.driver = driver
+        self.size = size
+        self.timeout = timeout
+        self.poll_frequency = poll_frequency
+        self._home = None
+        self._tabs = []
+
+    def _open_tabs(self):
+        if self._home is None:
+            self._home = self.driver.current_window_handle
+        while len(self._tabs) < self.size:
+            self.driver.switch_to.new_window("tab")
+            patterns = getattr(self.driver, "blocked_urls", None)
+            if patterns is not None:
+                block_urls(self.driver, patterns)
+            self._tabs.append(self.driver.current_window_handle)
+
+    def _navigate(self, tab, url):
+        limiter = getattr(self.driver, "rate_limiter", None) or Scraper.RATE_LIMITER
+        if limiter is not None:
+            limiter.wait(url)
+        self.driver.switch_to.window(tab)
+        # unlike driver.get, returns as soon as the navigation has started
+        self.driver.execute_script(scripts.TAB_NAVIGATE, url)
+
+    def _poll(self, tab, url, deadline, ready, scroll, parser):
+        """The tab's result if its page is done, else None."""
+        try:
+            self.driver.switch_to.window(tab)
+            if not self.driver.execute_script(scripts.TAB_READY, list(ready), scroll):
+                if time.monotonic() < deadline:
+                    return None
+                raise TimeoutException(f"{url} was not ready after {self.timeout}s")
+            page_source = self.driver.page_source
+            return TabResult(url, parser(page_source) if parser else page_source)
+        except Exception as e:
+            return TabResult(url, error=e)
+
+    def map(self, urls, parser=None, ready=(), scroll=False):
+        """Load `urls` across the tabs and yield a `TabResult` for each, in the order they finish.
+
+        Args:
+            urls: The pages to load
+            parser: Called with the page source of each finished page, its return value is the result's `value`
+                (default: the page source itself)
+            ready: CSS selectors that must all be on a page before it is read
+            scroll: Scroll each page to the bottom while waiting, for lists that load lazily
+
+        The driver is back on its own window whenever a result is yielded, so the
+        caller can use it in between.
+        """
+        if isinstance(ready, str):
+            ready = (ready,)
+        urls = iter(urls)
+        self._open_tabs()
+        free = list(self._tabs)
+        in_flight = {}
+        try:
+            while True:
+                finished = []
+                while free:
+                    url = next(urls, None)
+                    if url is None:
+                        break
+                    tab = free.pop()
+                    try:
+                        self._navigate(tab, url)
+                    except Exception as e:
+                        free.append(tab)
+                        finished.append(TabResult(url, error=e))
+                        continue
+                    in_flight[tab] = (url, time.monotonic() + self.timeout)
+                if not in_flight and not finished:
+                    return
+
+                for tab, (url, deadline) in list(in_flight.items()):
+                    result = self._poll(tab, url, deadline, ready, scroll, parser)
+                    if result is not None:
+                        del in_flight[tab]
+                        free.append(tab)
+                        finished.append(result)
+
+                if finished:
+                    self.driver.switch_to.window(self._home)
+                    yield from finished
+                else:
+                    time.sleep(self.poll_frequency)
+        finally:
+            if self._home is not None:
+                self.driver.switch_to.window(self._home)
+
+    def close(self):
+        for tab in self._tabs:
+            try:
+                self.driver.switch_to.window(tab)
+                self.driver.close()
+            except Exception:
+                pass
+        self._tabs = []
+        if self._home is not None:
+            self.driver.switch_to.window(self._home)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def scrape_jobs(driver, urls, tabs=4, timeout=30):
+    """Scrape job postings in `tabs` parallel tabs of one logged-in `driver`.
+
+    Yields a `TabResult` per url as each page finishes, with a `Job` as its value.
+    Pages are saved to `Scraper.SNAPSHOTS` if it is set.
+    """
+    with TabPool(driver, size=tabs, timeout=timeout) as pool:
+        for result in pool.map(urls, ready=JOB_READY):
+            if result.ok:
+                job = Job(linkedin_url=result.url, scrape=False)
+                job.record_page(result.url, result.value)
+                try:
+                    for field, value in parsers.parse_job(result.value).items():
+                        setattr(job, field, value)
+                    result.value = job
+                except Exception as e:
+                    result.value, result.error = None, e
+            yield result
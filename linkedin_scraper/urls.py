@@ -0,0 +1,48 @@
+import re
+import urllib.parse
+
+LINKEDIN_HOST = "www.linkedin.com"
+
+# /in/<slug>/<language> is the same profile rendered in another language
+_LOCALE_SUFFIX = re.compile(r"^(/in/[^/]+)/[a-z]{2}(?:[-_][a-z]{2})?$")
+_JOB_VIEW = re.compile(r"/jobs/view/(?:[^/?#]*?-)?(\d+)")
+
+
+def is_linkedin_host(host):
+    return host == "linkedin.com" or host.endswith(".linkedin.com")
+
+
+def normalize_url(url):
+    """Return the canonical form of a LinkedIn url, used as a key for caching and deduplication.
+
+    Query strings, fragments and trailing slashes are dropped, and country
+    subdomains (`ca.linkedin.com`) and language suffixes (`/in/<slug>/fr`) are
+    folded into the `www.linkedin.com` url. Other hosts keep their scheme and host.
+    """
+    if not url:
+        return url
+    parts = urllib.parse.urlsplit(url.strip())
+    scheme = parts.scheme.lower() or "https"
+    host = parts.netloc.lower()
+    path = re.sub(r"/{2,}", "/", parts.path).rstrip("/")
+
+    if is_linkedin_host(host):
+        scheme = "https"
+        host = LINKEDIN_HOST
+        path = path.lower()
+        path = _LOCALE_SUFFIX.sub(r"\1", path)
+
+    return urllib.parse.urlunsplit((scheme, host, path, "", ""))
+
+
+def job_id(url):
+    """The numeric ID of a job url (`/jobs/view/<id>` or `?currentJobId=<id>`), else its normalized url."""
+    if not url:
+        return url
+    match = _JOB_VIEW.search(url)
+    if match:
+        return match.group(1)
+    current = urllib.parse.parse_qs(urllib.parse.urlsplit(url).query).get("currentJobId")
+    if current:
+        return current[0]
+    return normalize_url(url)
@@ -0,0 +1,36 @@
+def document_ready(driver):
+    return driver.execute_script("return document.readyState;") == "complete"
+
+
+class count_is_stable(object):
+    """The number of elements matching `locator` is non-zero and did not change for `polls` polls in a row."""
+
+    def __init__(self, locator, base=None, polls=2, minimum=1):
+        self.locator = locator
+        self.base = base
+        self.polls = polls
+        self.minimum = minimum
+        self.last_count = None
+        self.stable_polls = 0
+
+    def __call__(self, driver):
+        elements = (self.base or driver).find_elements(*self.locator)
+        if len(elements) >= self.minimum and len(elements) == self.last_count:
+            self.stable_polls += 1
+        else:
+            self.stable_polls = 0
+        self.last_count = len(elements)
+        return elements if self.stable_polls >= self.polls else False
+
+
+class count_above(object):
+    """More than `count` elements match `locator`."""
+
+    def __init__(self, locator, count, base=None):
+        self.locator = locator
+        self.count = count
+        self.base = base
+
+    def __call__(self, driver):
+        elements = (self.base or driver).find_elements(*self.locator)
+        return elements if len(elements) > self.count else False
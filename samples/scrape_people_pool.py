@@ -0,0 +1,17 @@
+import os
+import sys
+from dotenv import load_dotenv
+from linkedin_scraper.pool import scrape_people
+from linkedin_scraper.session import SessionStore
+
+load_dotenv()
+
+email = os.getenv("LINKEDIN_USER")
+password = os.getenv("LINKEDIN_PASSWORD")
+urls = sys.argv[1:]
+
+for result in scrape_people(urls, workers=4, email=email, password=password, session=SessionStore()):
+    if result.ok:
+        print(result.url, result.value.name, result.value.job_title)
+    else:
+        print(result.url, "failed:", result.error)
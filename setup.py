@@ -29,6 +29,8 @@ setup(
     download_url = 'https://github.com/joeyism/linkedin_scraper/dist/' + version + '.tar.gz', 
     keywords = ['linkedin', 'scraping', 'scraper'],
     classifiers = [], 
-    install_requires=[package.split("\n")[0] for package in open("requirements.txt", "r").readlines()]
+    install_requires=[package.split("\n")[0] for package in open("requirements.txt", "r").readlines()],
+    extras_require={"msgpack": ["msgpack"]},
+    entry_points={"console_scripts": ["linkedin-scraper=linkedin_scraper.cli:main"]}
 )
 
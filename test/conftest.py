@@ -0,0 +1,14 @@
+import os
+
+import pytest
+
+FIXTURES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks", "fixtures")
+
+
+@pytest.fixture
+def page():
+    """Read a page of `benchmarks/fixtures` by file name."""
+    def read(name):
+        with open(os.path.join(FIXTURES, name), encoding="utf-8") as f:
+            return f.read()
+    return read
@@ -0,0 +1,147 @@
+import pytest
+
+from linkedin_scraper import cache as cache_module
+from linkedin_scraper.cache import ScrapeCache
+
+
+class Clock(object):
+    def __init__(self, now=1000000.0):
+        self.now = now
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(cache_module, "time", clock)
+    return clock
+
+
+@pytest.fixture
+def cache(tmp_path, clock):
+    with ScrapeCache(str(tmp_path / "cache.sqlite"), ttl={"person": 100}) as cache:
+        yield cache
+
+
+def test_get_uses_the_normalized_url(cache):
+    cache.put("person", "https://ca.linkedin.com/in/jane/?trk=x", {"name": "Jane"})
+    assert cache.get("person", "https://www.linkedin.com/in/jane") == {"name": "Jane"}
+    assert cache.get("company", "https://www.linkedin.com/in/jane") is None
+
+
+def test_entries_expire_after_their_ttl(cache, clock):
+    cache.put("person", "https://www.linkedin.com/in/jane", {"name": "Jane"})
+    clock.now += 100
+    assert cache.get("person", "https://www.linkedin.com/in/jane") == {"name": "Jane"}
+    clock.now += 1
+    assert cache.get("person", "https://www.linkedin.com/in/jane", include_expired=True) == {"name": "Jane"}
+    assert cache.get("person", "https://www.linkedin.com/in/jane") is None
+    # the expired entry was deleted on the miss
+    assert cache.get("person", "https://www.linkedin.com/in/jane", include_expired=True) is None
+
+
+def test_touch_restarts_the_ttl(cache, clock):
+    cache.put("person", "https://www.linkedin.com/in/jane", {"name": "Jane"})
+    clock.now += 90
+    cache.touch("person", "https://www.linkedin.com/in/jane")
+    clock.now += 90
+    assert cache.get("person", "https://www.linkedin.com/in/jane") == {"name": "Jane"}
+
+
+def test_evict_drops_the_least_recently_used(tmp_path, clock):
+    with ScrapeCache(str(tmp_path / "cache.sqlite"), max_entries={"person": 2}) as cache:
+        for name in ("a", "b", "c"):
+            cache.put("person", f"https://www.linkedin.com/in/{name}", {"name": name})
+            clock.now += cache.TOUCH_INTERVAL + 1
+        # reading "a" makes "b" the least recently used
+        assert cache.get("person", "https://www.linkedin.com/in/a") == {"name": "a"}
+        cache.evict()
+        assert cache.get("person", "https://www.linkedin.com/in/b") is None
+        assert cache.get("person", "https://www.linkedin.com/in/a") == {"name": "a"}
+        assert cache.get("person", "https://www.linkedin.com/in/c") == {"name": "c"}
+
+
+def test_put_evicts_every_evict_every_writes(tmp_path, clock, monkeypatch):
+    monkeypatch.setattr(ScrapeCache, "EVICT_EVERY", 3)
+    with ScrapeCache(str(tmp_path / "cache.sqlite"), max_entries={"person": 2}) as cache:
+        for name in ("a", "b", "c"):
+            cache.put("person", f"https://www.linkedin.com/in/{name}", {"name": name})
+            clock.now += 1
+        assert cache.get("person", "https://www.linkedin.com/in/a") is None
+        assert cache.get("person", "https://www.linkedin.com/in/c") == {"name": "c"}
+
+
+class FakePerson(object):
+    """Records the kwargs it was built with, and reports itself unchanged when told to."""
+
+    built = []
+
+    def __init__(self, linkedin_url=None, last_fingerprint=None, fingerprint="fp", name="Jane", **kwargs):
+        self.linkedin_url = linkedin_url
+        self.last_fingerprint = last_fingerprint
+        self.fingerprint = fingerprint
+        self.name = name
+        self.unchanged = last_fingerprint is not None and last_fingerprint == fingerprint
+        FakePerson.built.append(self)
+
+    def to_dict(self):
+        return {"linkedin_url": self.linkedin_url, "name": self.name, "fingerprint": self.fingerprint}
+
+    @classmethod
+    def from_dict(cls, data):
+        person = cls.__new__(cls)
+        person.linkedin_url, person.name, person.fingerprint = data["linkedin_url"], data["name"], data["fingerprint"]
+        person.unchanged = False
+        return person
+
+
+@pytest.fixture
+def fake_cache(cache, monkeypatch):
+    monkeypatch.setattr(cache, "TYPES", {"person": FakePerson})
+    FakePerson.built = []
+    return cache
+
+
+URL = "https://www.linkedin.com/in/jane"
+
+
+def test_fetch_returns_a_fresh_hit_without_scraping(fake_cache):
+    fake_cache.put("person", URL, {"linkedin_url": URL, "name": "Jane", "fingerprint": "fp"})
+    person = fake_cache.fetch("person", URL)
+    assert person.name == "Jane" and not person.unchanged
+    assert FakePerson.built == []
+
+
+@pytest.mark.parametrize("refresh", [False, True])
+def test_fetch_passes_the_fingerprint_of_an_expired_entry(fake_cache, clock, refresh):
+    fake_cache.put("person", URL, {"linkedin_url": URL, "name": "Old", "fingerprint": "fp2"})
+    clock.now += 101
+    person = fake_cache.fetch("person", URL, refresh=refresh)
+    assert FakePerson.built[0].last_fingerprint == "fp2"
+    assert person.name == "Jane"
+    assert fake_cache.get("person", URL)["fingerprint"] == "fp"
+
+
+def test_fetch_returns_the_stored_entry_of_an_unchanged_page(fake_cache, clock):
+    fake_cache.put("person", URL, {"linkedin_url": URL, "name": "Stored", "fingerprint": "fp"})
+    clock.now += 101
+    person = fake_cache.fetch("person", URL)
+    assert FakePerson.built[0].last_fingerprint == "fp"
+    assert person.unchanged and person.name == "Stored"
+    # the TTL was restarted, so the entry is a plain hit again
+    assert fake_cache.get("person", URL)["name"] == "Stored"
+
+
+def test_fetch_builds_a_miss_with_the_scrape_callable(fake_cache):
+    calls = []
+
+    def scrape(**kwargs):
+        calls.append(kwargs)
+        return FakePerson(URL, **kwargs)
+
+    fake_cache.fetch("person", URL, scrape=scrape, driver="driver")
+    assert calls == [{"driver": "driver"}]
+    assert fake_cache.fetch("person", URL, scrape=scrape) is not None
+    assert len(calls) == 1
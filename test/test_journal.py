@@ -0,0 +1,91 @@
+from linkedin_scraper import journal as journal_module
+from linkedin_scraper.journal import CrawlJournal, resume
+from linkedin_scraper.pool import PoolResult
+
+URLS = [f"https://www.linkedin.com/in/person-{i}" for i in range(4)]
+
+
+class Scraped(object):
+    def __init__(self, url):
+        self.url = url
+
+    def to_dict(self):
+        return {"url": self.url}
+
+
+def fake_scrape_people(fail=()):
+    """A `scrape_people` that scrapes every url at once, failing those in `fail`."""
+    def scrape_people(urls, **kwargs):
+        for url in urls:
+            if url in fail:
+                yield PoolResult(url=url, error=RuntimeError("boom"))
+            else:
+                yield PoolResult(url=url, value=Scraped(url))
+    return scrape_people
+
+
+def test_add_ignores_known_urls(tmp_path):
+    with CrawlJournal(str(tmp_path / "crawl.journal")) as journal:
+        assert journal.add(URLS) == 4
+        assert journal.add(URLS + ["https://ca.linkedin.com/in/person-0/", "https://www.linkedin.com/in/new"]) == 1
+        assert journal.todo() == URLS + ["https://www.linkedin.com/in/new"]
+
+
+def test_todo_skips_done_and_retries_failures_up_to_max_attempts(tmp_path):
+    with CrawlJournal(str(tmp_path / "crawl.journal")) as journal:
+        journal.add(URLS)
+        for url in URLS[:3]:
+            journal.start(url)
+        journal.done(URLS[0], {"name": "zero"})
+        journal.failed(URLS[1], RuntimeError("boom"))
+        # URLS[2] was interrupted in flight, URLS[3] never started
+        assert journal.todo(max_attempts=2) == URLS[1:]
+        journal.start(URLS[1])
+        journal.failed(URLS[1], RuntimeError("boom"))
+        assert journal.todo(max_attempts=2) == URLS[2:]
+        assert journal.counts() == {"pending": 1, "in_flight": 1, "done": 1, "failed": 1}
+        assert list(journal.results()) == [(URLS[0], {"name": "zero"})]
+        assert list(journal.failures()) == [(URLS[1], 2, "RuntimeError('boom')")]
+
+
+
+def test_urls_left_in_flight_are_given_up_after_max_attempts(tmp_path):
+    path = str(tmp_path / "crawl.journal")
+    for attempt in range(3):
+        with CrawlJournal(path) as journal:
+            journal.add(URLS[:2])
+            assert journal.todo(max_attempts=3) == URLS[:2]
+            # URLS[0] takes the crawl down with it every time, URLS[1] is never started
+            journal.start(URLS[0])
+    with CrawlJournal(path) as journal:
+        assert journal.todo(max_attempts=3) == [URLS[1]]
+        assert journal.todo(max_attempts=4) == URLS[:2]
+
+def test_a_crash_loses_only_the_unflushed_batch(tmp_path):
+    path = str(tmp_path / "crawl.journal")
+    journal = CrawlJournal(path, batch_size=3, flush_interval=3600)
+    journal.add(URLS)
+    journal.start(URLS[0])
+    journal.done(URLS[0], {})
+    journal.start(URLS[1])
+    # written with the start of URLS[1], the two changes after it are still buffered
+    journal.done(URLS[1], {})
+    journal.start(URLS[2])
+    # no close, as if the process was killed here
+    with CrawlJournal(path) as reopened:
+        assert reopened.todo() == URLS[1:]
+    journal.connection.close()
+
+
+def test_resume_scrapes_only_what_is_left(tmp_path, monkeypatch):
+    path = str(tmp_path / "crawl.journal")
+    monkeypatch.setattr(journal_module, "scrape_people", fake_scrape_people(fail={URLS[1]}))
+    first = list(resume(path, URLS))
+    assert [result.ok for result in first] == [True, False, True, True]
+
+    monkeypatch.setattr(journal_module, "scrape_people", fake_scrape_people())
+    second = list(resume(path, URLS))
+    assert [result.url for result in second] == [URLS[1]]
+    with CrawlJournal(path) as journal:
+        assert journal.todo() == []
+        assert [url for url, _ in journal.results()] == URLS
@@ -0,0 +1,148 @@
+import pytest
+
+from linkedin_scraper import parsers
+from linkedin_scraper.objects import Education, Experience
+
+
+def test_parse_experiences(page):
+    experiences = parsers.parse_experiences(page("experience.html"))
+    assert len(experiences) == 5
+    assert all(isinstance(experience, Experience) for experience in experiences)
+    first = experiences[0]
+    assert first.position_title == "Staff Engineer"
+    assert first.linkedin_url == "https://www.linkedin.com/company/1001/"
+    assert (first.from_date, first.to_date) == ("Jan 2021", "Present")
+    assert first.duration == "3 yrs 9 mos"
+    assert first.location == "Toronto, Ontario, Canada"
+    assert first.description == "Leads the ingestion platform team."
+    assert experiences[-1].institution_name == "Globex"
+
+
+def test_parse_experiences_of_several_positions_at_one_company(page):
+    hooli = [experience for experience in parsers.parse_experiences(page("experience.html")) if experience.institution_name == "Hooli"]
+    assert [
+        (experience.position_title, experience.from_date, experience.to_date, experience.duration, experience.location)
+        for experience in hooli
+    ] == [
+        ("Engineering Manager", "Apr 2016", "Feb 2017", "11 mos", "Palo Alto, California, United States · On-site"),
+        ("Software Engineer", "Jan 2014", "Mar 2016", "2 yrs 3 mos", "Mountain View, California, United States"),
+    ]
+    assert all(experience.linkedin_url == "https://www.linkedin.com/company/1004/" for experience in hooli)
+    assert "Ran the compression team." in hooli[0].description
+
+
+def test_parse_educations(page):
+    educations = parsers.parse_educations(page("education.html"))
+    assert len(educations) == 2
+    assert all(isinstance(education, Education) for education in educations)
+    first = educations[0]
+    assert first.institution_name == "University of Toronto"
+    assert first.linkedin_url == "https://www.linkedin.com/school/4001/"
+    assert first.degree == "Master of Science - MS, Computer Science"
+    assert (first.from_date, first.to_date) == ("2012", "2014")
+
+
+def test_parse_details_of_empty_page():
+    assert parsers.parse_experiences("<html><body></body></html>") == []
+    assert parsers.parse_educations("<html><body></body></html>") == []
+
+
+def test_parse_job(page):
+    job = parsers.parse_job(page("job.html"))
+    assert job["job_title"] == "Family Doctor"
+    assert job["company"] == "Clinic 0"
+    assert job["company_linkedin_url"] == "https://www.linkedin.com/company/clinic-0/life"
+    assert job["location"] == "Toronto, ON"
+    assert job["posted_date"] == "2 weeks ago"
+    assert job["applicant_count"] == "Over 100 applicants"
+    assert job["job_description"].startswith("About the job\nClinic 0 is hiring")
+    assert job["benefits"] == "CA$250K/yr - CA$320K/yr"
+
+
+def test_parse_public_company(page):
+    company = parsers.parse_public_company(page("company_public.html"))
+    assert company == {
+        "name": "Acme",
+        "about_us": "Acme builds data infrastructure for logistics companies.",
+        "specialties": "Data pipelines, Logistics, Route planning",
+        "website": "https://acme.example.com",
+        "phone": "+1 416 555 0100",
+        "headquarters": "Toronto, Ontario, Canada",
+        "industry": "Software Development",
+        "company_size": "51-200 employees",
+        "company_type": "Privately Held",
+        "founded": "2014",
+    }
+
+
+def test_parse_profile(page):
+    profile = parsers.parse_profile(page("profile.html"))
+    assert profile["name"] == "Jane Doe"
+    assert profile["location"] == "Toronto, Ontario, Canada"
+    assert profile["about"].startswith("I build data pipelines")
+    assert profile["open_to_work"] is True
+    assert [interest.title for interest in profile["interests"]] == ["Python Software Foundation", "Distributed Systems"]
+    assert [(item.category, item.title) for item in profile["accomplishments"]] == [
+        ("Languages", "English"), ("Languages", "French")
+    ]
+
+
+def test_parse_company_about(page):
+    about = parsers.parse_company_about(page("company_about.html"))
+    assert about == {
+        "name": "Acme",
+        "about_us": "Acme builds data infrastructure for logistics companies.",
+        "website": "https://acme.example",
+        "phone": "+1 416 555 0100",
+        "industry": "Software Development",
+        "company_size": "51-200 employees",
+        "headquarters": "Toronto, Ontario",
+        "company_type": "Privately Held",
+        "founded": "2009",
+        "specialties": "logistics\nstream processing\ndata engineering",
+        "headcount": 120,
+    }
+
+
+def test_parse_employees(page):
+    employees = parsers.parse_employees(page("people.html"))
+    assert len(employees) == 12
+    assert employees[0] == {
+        "name": "Employee 0",
+        "designation": "Engineer 0 at Acme",
+        "linkedin_url": "https://www.linkedin.com/in/employee-0/",
+    }
+
+
+def test_parse_job_cards(page):
+    cards = parsers.parse_job_cards(page("job_search.html"), "https://www.linkedin.com/jobs/search/")
+    assert len(cards) == 25
+    assert cards[0] == {
+        "title": "Family Doctor 0",
+        "linkedin_url": "https://www.linkedin.com/jobs/view/3900000000/?refId=abc&trackingId=xyz",
+        "company": "Clinic 0",
+        "location": "Toronto, ON (On-site)",
+    }
+
+
+def test_parse_people_cards(page):
+    urls = parsers.parse_people_cards(page("people_search.html"))
+    assert len(urls) == 10
+    assert urls[:2] == ["https://www.linkedin.com/in/jane-doe-0", "https://www.linkedin.com/in/jane-doe-1"]
+
+
+def test_parse_company_about_headcount_with_separators(page):
+    about = page("company_about.html").replace("See all 120 employees", "See all 1,234 employees")
+    assert parsers.parse_company_about(about)["headcount"] == 1234
+
+
+@pytest.mark.parametrize("span_text, headcount", [
+    ("See all 120 employees on LinkedIn", 120),
+    ("See all 12,345 employees on LinkedIn", 12345),
+    ("See all 1\u202f234 employees on LinkedIn", 1234),
+    ("See all 1.234 employees on LinkedIn", 1234),
+    ("See all many employees on LinkedIn", None),
+    ("Follow", None),
+])
+def test_parse_headcount(span_text, headcount):
+    assert parsers.parse_headcount(span_text) == headcount
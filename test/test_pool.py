@@ -0,0 +1,28 @@
+from linkedin_scraper import person
+from linkedin_scraper.pool import DriverPool
+
+
+class FakeDriver(object):
+    def __init__(self, session_id):
+        self.session_id = session_id
+        self.quit_called = False
+
+    def execute_script(self, script):
+        return 1
+
+    def quit(self):
+        self.quit_called = True
+
+
+def test_quit_drivers_forget_their_connections(monkeypatch):
+    monkeypatch.setattr(person, "_session_connections", {"kept": []})
+    drivers = iter([FakeDriver("first"), FakeDriver("second")])
+    pool = DriverPool(size=2, driver_factory=lambda: next(drivers), login=False)
+    first, second = pool.acquire(), pool.acquire()
+    person._session_connections.update({"first": [], "second": []})
+
+    pool.discard(first)
+    assert set(person._session_connections) == {"kept", "second"}
+    pool.close()
+    assert set(person._session_connections) == {"kept"}
+    assert first.quit_called and second.quit_called
@@ -0,0 +1,75 @@
+import pytest
+
+from linkedin_scraper import ratelimit
+from linkedin_scraper.ratelimit import FileTokenBucket, TokenBucket, classify
+
+
+class Clock(object):
+    """Stands in for the `time` module, `sleep` moves the clock forward."""
+
+    def __init__(self, now=1000.0):
+        self.now = now
+        self.slept = []
+
+    def monotonic(self):
+        return self.now
+
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(ratelimit, "time", clock)
+    return clock
+
+
+def test_burst_is_free_then_tokens_come_at_the_rate(clock):
+    bucket = TokenBucket(rate=2, burst=3)
+    assert [bucket.reserve() for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert bucket.reserve() == pytest.approx(0.5)
+    assert bucket.reserve() == pytest.approx(1.0)
+
+
+def test_tokens_refill_up_to_the_burst(clock):
+    bucket = TokenBucket(rate=1, burst=2)
+    bucket.reserve(2)
+    clock.now += 60
+    assert bucket.reserve(2) == 0.0
+    assert bucket.reserve() == pytest.approx(1.0)
+
+
+def test_acquire_sleeps_for_the_reserved_delay(clock):
+    bucket = TokenBucket(rate=4, burst=1)
+    assert bucket.acquire() == 0.0
+    assert bucket.acquire() == pytest.approx(0.25)
+    assert clock.slept == [pytest.approx(0.25)]
+    # the sleep paid for that token, the next one waits a full interval again
+    assert bucket.acquire() == pytest.approx(0.25)
+
+
+def test_file_buckets_on_one_path_share_their_tokens(tmp_path, clock):
+    path = str(tmp_path / "bucket.json")
+    first, second = FileTokenBucket(path, rate=1, burst=2), FileTokenBucket(path, rate=1, burst=2)
+    assert first.reserve() == 0.0
+    assert second.reserve() == 0.0
+    assert first.reserve() == pytest.approx(1.0)
+    clock.now += 10
+    assert second.reserve() == 0.0
+
+
+@pytest.mark.parametrize("url, url_class", [
+    ("https://www.linkedin.com/in/jane/details/experience/", "profile_details"),
+    ("https://www.linkedin.com/in/jane/", "profile"),
+    ("https://www.linkedin.com/company/acme/about/", "company"),
+    ("https://www.linkedin.com/jobs/view/3900000000/", "job"),
+    ("https://www.linkedin.com/jobs/search/?keywords=doctor", "search"),
+    ("https://www.linkedin.com/feed/", "other"),
+])
+def test_classify(url, url_class):
+    assert classify(url) == url_class
@@ -0,0 +1,88 @@
+import json
+
+from selenium.webdriver.common.by import By
+
+from linkedin_scraper.selectors import SelectorRegistry, any_of_located
+
+FIELDS = {"title": [(By.CLASS_NAME, "old-title"), (By.CLASS_NAME, "new-title"), (By.TAG_NAME, "h1")]}
+
+
+class FakeDriver(object):
+    """Matches the locators in `present`, with no `execute_script` so each locator is checked in turn."""
+
+    def __init__(self, *present):
+        self.present = set(present)
+        self.lookups = []
+
+    def find_elements(self, by, value):
+        self.lookups.append((by, value))
+        return [f"<{value}>"] if (by, value) in self.present else []
+
+
+def test_fallbacks_keep_their_order_until_one_matches():
+    registry = SelectorRegistry(FIELDS)
+    assert registry.candidates("title") == FIELDS["title"]
+    registry.succeeded("title", (By.CLASS_NAME, "new-title"))
+    assert registry.candidates("title") == [
+        (By.CLASS_NAME, "new-title"), (By.CLASS_NAME, "old-title"), (By.TAG_NAME, "h1")
+    ]
+
+
+def test_order_is_in_memory_without_a_path(tmp_path):
+    registry = SelectorRegistry(FIELDS)
+    registry.succeeded("title", (By.TAG_NAME, "h1"))
+    assert registry.save() is False
+    assert list(tmp_path.iterdir()) == []
+    assert SelectorRegistry(FIELDS).candidates("title") == FIELDS["title"]
+
+
+def test_order_is_saved_and_loaded_with_a_path(tmp_path):
+    path = str(tmp_path / "selectors" / "order.json")
+    SelectorRegistry(FIELDS, path=path).succeeded("title", (By.TAG_NAME, "h1"))
+    with open(path, encoding="utf-8") as f:
+        assert json.load(f) == {"title": [By.TAG_NAME, "h1"]}
+    assert SelectorRegistry(FIELDS, path=path).candidates("title")[0] == (By.TAG_NAME, "h1")
+
+
+def test_a_saved_locator_that_is_no_longer_a_fallback_is_ignored(tmp_path):
+    path = tmp_path / "order.json"
+    path.write_text(json.dumps({"title": [By.CLASS_NAME, "removed"]}))
+    assert SelectorRegistry(FIELDS, path=str(path)).candidates("title") == FIELDS["title"]
+
+
+def test_an_unreadable_order_file_is_ignored(tmp_path):
+    path = tmp_path / "order.json"
+    path.write_text("not json")
+    assert SelectorRegistry(FIELDS, path=str(path)).candidates("title") == FIELDS["title"]
+
+
+def test_a_failed_save_does_not_raise(tmp_path):
+    blocker = tmp_path / "file"
+    blocker.write_text("")
+    registry = SelectorRegistry(FIELDS, path=str(blocker / "order.json"))
+    registry.succeeded("title", (By.TAG_NAME, "h1"))
+    assert registry.save() is False
+    assert registry.candidates("title")[0] == (By.TAG_NAME, "h1")
+
+
+def test_find_all_returns_the_first_match_and_puts_it_first():
+    registry = SelectorRegistry(FIELDS)
+    driver = FakeDriver((By.CLASS_NAME, "new-title"), (By.TAG_NAME, "h1"))
+    assert registry.find_all(driver, "title", timeout=0) == ["<new-title>"]
+    assert registry.candidates("title")[0] == (By.CLASS_NAME, "new-title")
+    driver.lookups = []
+    assert registry.find(driver, "title", timeout=0) == "<new-title>"
+    assert driver.lookups == [(By.CLASS_NAME, "new-title")]
+
+
+def test_find_all_times_out_to_an_empty_list():
+    registry = SelectorRegistry(FIELDS)
+    assert registry.find_all(FakeDriver(), "title", timeout=0) == []
+    assert registry.find(FakeDriver(), "title", timeout=0) is None
+    assert registry.candidates("title") == FIELDS["title"]
+
+
+def test_any_of_located_checks_every_locator_on_each_poll():
+    condition = any_of_located(FIELDS["title"])
+    assert condition(FakeDriver()) is False
+    assert condition(FakeDriver((By.TAG_NAME, "h1"))) == (2, ["<h1>"])
@@ -0,0 +1,82 @@
+import os
+
+import pytest
+
+from linkedin_scraper.snapshots import PARSERS, SnapshotStore, classify, replay
+
+
+@pytest.fixture
+def store(tmp_path):
+    with SnapshotStore(str(tmp_path / "snapshots")) as store:
+        yield store
+
+
+def blobs(store):
+    return [name for _, _, names in os.walk(os.path.join(store.directory, "objects")) for name in names]
+
+
+@pytest.mark.parametrize("url, kind", [
+    ("https://www.linkedin.com/in/jane/details/experience/", "experience"),
+    ("https://www.linkedin.com/in/jane/", "profile"),
+    ("https://www.linkedin.com/company/acme/about/", "company_about"),
+    ("https://www.linkedin.com/company/acme/people/", "company_people"),
+    ("https://www.linkedin.com/jobs/view/3900000000/", "job"),
+    ("https://www.linkedin.com/jobs/search/?keywords=doctor", "job_search"),
+    ("https://www.linkedin.com/search/results/people/?keywords=jane", "people_search"),
+    ("https://www.linkedin.com/feed/", "other"),
+])
+def test_classify(url, kind):
+    assert classify(url) == kind
+
+
+def test_same_content_is_stored_once(store):
+    first = store.put("https://www.linkedin.com/in/jane", "<html>same</html>", fetched_at=1)
+    second = store.put("https://www.linkedin.com/in/john", "<html>same</html>", fetched_at=2)
+    third = store.put("https://www.linkedin.com/in/jane", "<html>changed</html>", fetched_at=3)
+    assert first == second != third
+    assert len(blobs(store)) == 2
+    assert store.get(first) == "<html>same</html>"
+    assert [snapshot.digest for snapshot in store.history("https://www.linkedin.com/in/jane")] == [first, third]
+
+
+def test_urls_are_indexed_normalized(store):
+    store.put("https://ca.linkedin.com/in/Jane/?trk=x", "<html>old</html>", fetched_at=1)
+    store.put("https://www.linkedin.com/in/jane/", "<html>new</html>", fetched_at=2)
+    latest = store.latest("https://www.linkedin.com/in/jane")
+    assert (latest.url, latest.kind, latest.fetched_at) == ("https://www.linkedin.com/in/jane", "profile", 2)
+    assert store.latest("https://www.linkedin.com/in/jane", before=2).fetched_at == 1
+    assert len(list(store.snapshots())) == 1
+
+
+def test_search_pages_keep_their_query(store):
+    store.put("https://www.linkedin.com/jobs/search/?keywords=doctor", "<html>doctors</html>")
+    store.put("https://www.linkedin.com/jobs/search/?keywords=nurse", "<html>nurses</html>")
+    assert len(list(store.snapshots("job_search"))) == 2
+
+
+def test_replay_parses_the_latest_of_each_page(store, page):
+    store.put("https://www.linkedin.com/in/jane/details/experience/", "<html></html>", fetched_at=1)
+    store.put("https://www.linkedin.com/in/jane/details/experience/", page("experience.html"), fetched_at=2)
+    store.put("https://www.linkedin.com/jobs/view/3900000000/", page("job.html"), fetched_at=3)
+    results = {result.snapshot.kind: result for result in replay(store, workers=1)}
+    assert set(results) == {"experience", "job"}
+    assert all(result.ok for result in results.values())
+    assert len(results["experience"].value) == 5
+    assert results["job"].value["job_title"] == "Family Doctor"
+
+    everything = list(replay(store, kinds="experience", latest=False, workers=2))
+    assert sorted(len(result.value) for result in everything) == [0, 5]
+
+
+def test_replay_reports_parser_errors_per_page(store):
+    store.put("https://www.linkedin.com/feed/", "<html></html>")
+
+    results = list(replay(store, kinds="other", kind_parsers={"other": int}, workers=1))
+    assert len(results) == 1 and not results[0].ok
+    assert isinstance(results[0].error, ValueError)
+
+
+def test_replay_needs_a_parser_for_each_kind(store):
+    with pytest.raises(ValueError):
+        list(replay(store, kinds="other"))
+    assert "other" not in PARSERS
@@ -0,0 +1,31 @@
+import pytest
+
+from linkedin_scraper.urls import job_id, normalize_url
+
+
+@pytest.mark.parametrize("url", [
+    "https://www.linkedin.com/in/jane-doe",
+    "https://www.linkedin.com/in/jane-doe/",
+    "http://www.linkedin.com/in/jane-doe?trk=pub-pbmap",
+    "https://ca.linkedin.com/in/Jane-Doe/#experience",
+    "https://linkedin.com//in/jane-doe",
+    "https://www.linkedin.com/in/jane-doe/fr",
+    " https://WWW.LINKEDIN.COM/in/jane-doe/en-us ",
+])
+def test_normalize_url_folds_variants_of_a_profile(url):
+    assert normalize_url(url) == "https://www.linkedin.com/in/jane-doe"
+
+
+def test_normalize_url_keeps_other_hosts():
+    assert normalize_url("http://Example.com/About/?q=1") == "http://example.com/About"
+
+
+def test_normalize_url_passes_empty_through():
+    assert normalize_url(None) is None
+    assert normalize_url("") == ""
+
+
+def test_job_id():
+    assert job_id("https://www.linkedin.com/jobs/view/family-doctor-at-clinic-3900000000/?refId=abc") == "3900000000"
+    assert job_id("https://www.linkedin.com/jobs/search/?currentJobId=3900000001&keywords=doctor") == "3900000001"
+    assert job_id("https://www.linkedin.com/jobs/collections/recommended/") == "https://www.linkedin.com/jobs/collections/recommended"